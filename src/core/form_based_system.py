@@ -55,6 +55,8 @@ class FormBasedDialogSystem:
     def __init__(self, business_line: str):
         self.business_line = business_line
         self.form_template = self._load_form_template(business_line)
+        self.required_slot_count = sum(1 for d in self.form_template.values() if d.required)
+        self.filled_required_names: Set[str] = set()  # 已填充的必填槽位，由 _set_slot_status 维护
         self.current_form = self._create_empty_form()
         self.pending_conflicts: List[Dict[str, SlotValue]] = []
         self.awaiting_conflict_slot: Optional[str] = None
@@ -65,6 +67,7 @@ class FormBasedDialogSystem:
         self.initial_prompt_shown: bool = False  # 是否已显示初始提示
         self.order_status: OrderStatus = OrderStatus.COLLECTING
         self.reselect_slot: Optional[str] = None  # 当前重选的槽位
+        self._command_keyword_cache: Dict[str, frozenset] = {}  # 命令关键词（业务配置不变，按类型缓存）
         
         # 业务过滤映射（来自配置文件）
         cfg = business_config_loader.get_business_config(business_line)
@@ -489,6 +492,18 @@ class FormBasedDialogSystem:
         
         return extraction_result
     
+    def process_batch(self, inputs: List[str], llm_client, semantic_mapper) -> List[Dict[str, Any]]:
+        """
+        按顺序处理一组用户输入（回放脚本）
+        
+        每轮的状态转移依赖上一轮结果，因此逐条调用 process_input；
+        与对话状态无关的准备工作（命令关键词等）在各轮之间复用。
+        
+        Returns:
+            与输入一一对应的处理结果列表
+        """
+        return [self.process_input(user_input, llm_client, semantic_mapper) for user_input in inputs]
+    
     def _extract_multiple_slots(self, user_input: str, llm_client, semantic_mapper) -> Dict[str, SlotValue]:
         """从用户输入中抽取多个槽位信息
         
@@ -899,7 +914,7 @@ class FormBasedDialogSystem:
         if slot.status == SlotStatus.EMPTY:
             # 空槽位直接填充
             slot.value = new_value
-            slot.status = SlotStatus.FILLED if new_value.confidence >= 0.7 else SlotStatus.PARTIAL
+            self._set_slot_status(slot, SlotStatus.FILLED if new_value.confidence >= 0.7 else SlotStatus.PARTIAL)
             result["updated"] = True
             result["filled"] = (slot.status == SlotStatus.FILLED)
         
@@ -908,7 +923,7 @@ class FormBasedDialogSystem:
             if self._should_trigger_conflict(slot.value, new_value):
                 # 存在冲突，保存候选值并标记冲突状态
                 slot.candidates.append(new_value)
-                slot.status = SlotStatus.CONFLICTED
+                self._set_slot_status(slot, SlotStatus.CONFLICTED)
                 result["conflict"] = True
             else:
                 # 相同值或兼容值，更新置信度或保持原值
@@ -1000,7 +1015,7 @@ class FormBasedDialogSystem:
         
         if decision == "1":
             # 保留原值，丢弃候选
-            slot.status = SlotStatus.FILLED
+            self._set_slot_status(slot, SlotStatus.FILLED)
             slot.candidates = []
             print(f"✅ 保留原值: {slot.definition.description} = {old_value}")
             
@@ -1014,7 +1029,7 @@ class FormBasedDialogSystem:
                 
                 # 填充新值
                 slot.value = new_val
-                slot.status = SlotStatus.FILLED if new_val.confidence >= 0.7 else SlotStatus.PARTIAL
+                self._set_slot_status(slot, SlotStatus.FILLED if new_val.confidence >= 0.7 else SlotStatus.PARTIAL)
                 slot.candidates = []
                 
                 source_prefix = self._get_source_prefix(new_val.source)
@@ -1305,12 +1320,18 @@ class FormBasedDialogSystem:
         # 颜色默认不做过滤
         return raw
     
+    def _set_slot_status(self, slot: FormSlot, status: SlotStatus):
+        """更新槽位状态，并同步已填充必填槽位集合"""
+        slot.status = status
+        if slot.definition.required:
+            if status == SlotStatus.FILLED:
+                self.filled_required_names.add(slot.definition.name)
+            else:
+                self.filled_required_names.discard(slot.definition.name)
+    
     def _check_form_completeness(self) -> bool:
         """检查必填槽位是否全部填充"""
-        for slot in self.current_form.values():
-            if slot.definition.required and slot.status != SlotStatus.FILLED:
-                return False
-        return True
+        return len(self.filled_required_names) == self.required_slot_count
     
     def _get_filled_slots_summary(self) -> str:
         """获取已填充槽位的摘要"""
@@ -1403,7 +1424,7 @@ class FormBasedDialogSystem:
     def _clear_slot_and_dependencies(self, slot_name: str):
         """清空指定槽位及其所有下游依赖槽位 - 同时清除验证错误"""
         # 清空当前槽位
-        self.current_form[slot_name].status = SlotStatus.EMPTY
+        self._set_slot_status(self.current_form[slot_name], SlotStatus.EMPTY)
         self.current_form[slot_name].value = None
         self.current_form[slot_name].candidates = []
         
@@ -1416,7 +1437,7 @@ class FormBasedDialogSystem:
             for name, slot in self.current_form.items():
                 if current_slot in slot.definition.dependencies:
                     # 清空这个依赖槽位
-                    slot.status = SlotStatus.EMPTY
+                    self._set_slot_status(slot, SlotStatus.EMPTY)
                     slot.value = None
                     slot.candidates = []
                     # 递归清空它的下游依赖
@@ -1424,12 +1445,18 @@ class FormBasedDialogSystem:
         
         clear_dependents(slot_name)
     
+    def reset(self):
+        """重置全部对话状态，等价于重新创建同一业务线的系统（复用已加载的槽位模板）"""
+        self._reset_form()
+        self.initial_prompt_shown = False
+    
     def _reset_form(self):
         """重置表单到初始状态"""
         for slot in self.current_form.values():
             slot.status = SlotStatus.EMPTY
             slot.value = None
             slot.candidates = []
+        self.filled_required_names.clear()
         
         self.pending_conflicts = []
         self.awaiting_conflict_slot = None
@@ -1440,20 +1467,29 @@ class FormBasedDialogSystem:
         self.reselect_slot = None
         self.last_prompted_slot = None
     
-    def _get_command_keywords(self, command_type: str, default_keywords: List[str]) -> set:
+    def _get_command_keywords(self, command_type: str, default_keywords: List[str]) -> frozenset:
         """
         从配置获取命令关键词，如果配置中没有则使用默认值
         支持通用命令关键词配置，使系统更灵活
         """
+        cached = self._command_keyword_cache.get(command_type)
+        if cached is not None:
+            return cached
+        
         # 尝试从业务配置的 command_keywords 字段获取
+        keywords = None
         cfg = business_config_loader.get_business_config(self.business_line)
         if cfg and hasattr(cfg, 'command_keywords'):
             command_keywords = getattr(cfg, 'command_keywords', {})
             if command_type in command_keywords:
-                return set(command_keywords[command_type])
+                keywords = frozenset(command_keywords[command_type])
         
         # 如果配置中没有，使用默认值
-        return set(default_keywords)
+        if keywords is None:
+            keywords = frozenset(default_keywords)
+        
+        self._command_keyword_cache[command_type] = keywords
+        return keywords
     
     def _get_next_missing_slot(self) -> Optional[str]:
         """获取下一个缺失的必填槽位"""
@@ -1503,7 +1539,7 @@ class FormBasedDialogSystem:
                         reason="业务线唯一选项"
                     )
                     slot.value = slot_value
-                    slot.status = SlotStatus.FILLED
+                    self._set_slot_status(slot, SlotStatus.FILLED)
                     print(f"🤖 自动设置: {slot.definition.description} = {single_option['label']}")
     
     def _get_source_prefix(self, source: str) -> str:
@@ -29,6 +29,8 @@ class FlowInterpreter:
         self.events = self.config.get('events', {})
         self.commands = self.config.get('commands', {})
         self.validations = self.config.get('validations', [])
+        # 命令表在初始化时展开为元组，每轮输入只做关键词匹配和条件检查
+        self._command_table = self._compile_commands(self.commands)
         
         # 注册槽位配置到表单系统
         self._register_slots_to_form()
@@ -103,28 +105,36 @@ class FlowInterpreter:
         self.last_response = result
         return result
     
+    @staticmethod
+    def _compile_commands(commands: Dict[str, Any]) -> tuple:
+        """将命令配置展开为 (关键词, 条件, 可用时机, 动作, 响应, 原配置) 元组，保持配置顺序"""
+        return tuple(
+            (
+                tuple(cmd_config.get('keywords', [])),
+                cmd_config.get('condition'),
+                cmd_config.get('available_when', 'always'),
+                cmd_config.get('action'),
+                cmd_config.get('response'),
+                cmd_config,
+            )
+            for cmd_config in commands.values()
+        )
+    
     def _check_commands(self, user_input: str) -> Optional[Dict[str, Any]]:
         """检查用户输入是否匹配命令"""
         user_input_lower = user_input.lower().strip()
         
-        for cmd_name, cmd_config in self.commands.items():
-            keywords = cmd_config.get('keywords', [])
-            
+        for keywords, condition, available_when, action, response, cmd_config in self._command_table:
             # 检查关键词匹配
             if any(kw in user_input_lower for kw in keywords):
                 # 检查命令可用条件
-                condition = cmd_config.get('condition')
                 if condition and not self._evaluate_condition(condition):
                     continue
                 
-                available_when = cmd_config.get('available_when', 'always')
                 if not self._check_availability(available_when):
                     continue
                 
                 # 执行命令动作
-                action = cmd_config.get('action')
-                response = cmd_config.get('response')
-                
                 return self._execute_command_action(action, response, cmd_config)
         
         return None
@@ -3,9 +3,18 @@ YAML流程定义加载器
 用于加载和验证基于YAML语法的DSL流程脚本
 """
 
-import yaml
+import hashlib
 import os
-from typing import Dict, Any, List
+import pickle
+from typing import Dict, Any, List, Tuple
+
+import yaml
+
+# 优先使用 libyaml 的 C 实现解析，PyYAML 未编译 libyaml 时回退到纯Python的SafeLoader
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# 已解析流程文件的缓存 {绝对路径: (内容摘要, pickle字节)}
+_PARSED_CACHE: Dict[str, Tuple[str, bytes]] = {}
 
 
 class YAMLFlowLoader:
@@ -31,8 +40,7 @@ class YAMLFlowLoader:
             raise FileNotFoundError(f"流程文件不存在: {yaml_file}")
         
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            config = YAMLFlowLoader._load_yaml_cached(yaml_file)
         except yaml.YAMLError as e:
             raise yaml.YAMLError(f"YAML解析错误: {e}")
         
@@ -46,6 +54,27 @@ class YAMLFlowLoader:
         
         return flow_config
     
+    @staticmethod
+    def _load_yaml_cached(yaml_file: str) -> Any:
+        """
+        解析YAML文件，解析结果以pickle字节缓存在进程内存中
+        
+        缓存以文件路径为键、文件内容的blake2b摘要校验，内容未变化时直接反序列化缓存，
+        跳过YAML解析；每次反序列化得到独立的副本，调用方修改返回值不会影响缓存。
+        """
+        with open(yaml_file, 'rb') as f:
+            content = f.read()
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        key = os.path.abspath(yaml_file)
+        
+        cached = _PARSED_CACHE.get(key)
+        if cached is not None and cached[0] == digest:
+            return pickle.loads(cached[1])
+        
+        config = yaml.load(content, Loader=_SafeLoader)
+        _PARSED_CACHE[key] = (digest, pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL))
+        return config
+    
     @staticmethod
     def validate(flow_config: Dict[str, Any]) -> bool:
         """
@@ -6,7 +6,8 @@
 import json
 import os
 from dataclasses import dataclass
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from core.interfaces import SlotSpec
 
 
@@ -149,6 +150,10 @@ class BusinessConfigLoader:
         templates = self.get_templates(business_name)
         return templates.get(template_key, [])
     
+    def get_enum(self, enum_key: str) -> List[Dict[str, Any]]:
+        """按全局键获取单个枚举（不复制整个注册表）"""
+        return self._enum_registry.get(enum_key, [])
+    
     def get_all_enums(self) -> Dict[str, List[Dict[str, Any]]]:
         """获取所有业务的枚举定义（向后兼容）"""
         return self._enum_registry.copy()
@@ -199,8 +204,7 @@ def get_slot_specs(business_name: str) -> List[SlotSpec]:
 
 def get_enum_options(enum_key: str) -> List[Dict[str, Any]]:
     """获取枚举选项的便捷函数（向后兼容）"""
-    all_enums = business_config_loader.get_all_enums()
-    return all_enums.get(enum_key, [])
+    return business_config_loader.get_enum(enum_key)
 
 
 def get_templates(business_name: str) -> Dict[str, List[str]]:
@@ -219,8 +223,22 @@ def get_slot_options(enum_key: str, business_name: str = None) -> List[Dict[str,
             return business_enums[enum_key]
     
     # 回退到全局枚举
-    all_enums = business_config_loader.get_all_enums()
-    return all_enums.get(enum_key, [])
+    return business_config_loader.get_enum(enum_key)
+
+
+@lru_cache(maxsize=None)
+def _match_table(enum_key: str) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """
+    枚举的(标签, 小写匹配词)表，匹配词依次为标签本身和各别名
+    
+    枚举在加载后不再变化，按键缓存，匹配时不再逐次对标签和别名调用lower()
+    """
+    table = []
+    for opt in get_slot_options(enum_key):
+        label = opt.get("label", "")
+        needles = (label.lower(),) + tuple(alias.lower() for alias in opt.get("aliases", []))
+        table.append((label, needles))
+    return tuple(table)
 
 
 def map_numeric(enum_key: str, number: int) -> Optional[str]:
@@ -243,24 +261,12 @@ def map_numeric(enum_key: str, number: int) -> Optional[str]:
 
 def unique_match(enum_key: str, user_input: str) -> Optional[str]:
     """唯一匹配（向后兼容）"""
-    options = get_slot_options(enum_key)
-    if not options:
+    table = _match_table(enum_key)
+    if not table:
         return None
     
     text = user_input.lower()
-    hits = []
-    
-    for opt in options:
-        label = opt.get("label", "")
-        aliases = opt.get("aliases", [])
-        
-        if label.lower() in text:
-            hits.append(label)
-            continue
-        for alias in aliases:
-            if alias.lower() in text:
-                hits.append(label)
-                break
+    hits = [label for label, needles in table if any(n in text for n in needles)]
     
     # 去重
     hits = list(dict.fromkeys(hits))
@@ -271,23 +277,11 @@ def unique_match(enum_key: str, user_input: str) -> Optional[str]:
 
 def collect_matches(enum_key: str, user_input: str) -> List[str]:
     """收集所有匹配项（向后兼容）"""
-    options = get_slot_options(enum_key)
-    if not options:
+    table = _match_table(enum_key)
+    if not table:
         return []
     
     text = user_input.lower()
-    hits = []
-    
-    for opt in options:
-        label = opt.get("label", "")
-        aliases = opt.get("aliases", [])
-        
-        if label.lower() in text:
-            hits.append(label)
-            continue
-        for alias in aliases:
-            if alias.lower() in text:
-                hits.append(label)
-                break
+    hits = [label for label, needles in table if any(n in text for n in needles)]
     
-    return list(dict.fromkeys(hits))
\ No newline at end of file
+    return list(dict.fromkeys(hits))
@@ -0,0 +1,73 @@
+"""
+pytest共享夹具
+
+业务线的对话系统在整个测试会话内只构建一次，apple_store_form / dining_form 夹具在每个测试开始前
+调用 reset() 恢复初始状态，测试无需自行重置，结果也不依赖执行顺序；
+语义映射器无状态，同样在会话内共享。
+需要相同输入前缀的测试通过 form_after 获取前缀执行后的表单快照副本，前缀只执行一次。
+"""
+
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.form_based_system import FormBasedDialogSystem
+from semantics.option_mapping import SemanticMapper
+
+
+@pytest.fixture(scope="session")
+def _apple_store_system():
+    """苹果商店业务线对话系统（会话内只构建一次）"""
+    return FormBasedDialogSystem('apple_store')
+
+
+@pytest.fixture(scope="session")
+def _dining_system():
+    """餐饮预订业务线对话系统（会话内只构建一次）"""
+    return FormBasedDialogSystem('dining')
+
+
+@pytest.fixture
+def apple_store_form(_apple_store_system):
+    """苹果商店业务线对话系统，已重置为初始状态"""
+    _apple_store_system.reset()
+    return _apple_store_system
+
+
+@pytest.fixture
+def dining_form(_dining_system):
+    """餐饮预订业务线对话系统，已重置为初始状态"""
+    _dining_system.reset()
+    return _dining_system
+
+
+@pytest.fixture(scope="session")
+def semantic_mapper():
+    """本地语义映射器（无状态，会话共享）"""
+    return SemanticMapper()
+
+
+@pytest.fixture(scope="session")
+def form_after(semantic_mapper):
+    """
+    返回 form_after(steps, business_line='apple_store')
+    
+    每个 (业务线, 输入前缀) 只真正执行一次并以pickle快照缓存，
+    之后每次调用反序列化出一份独立的表单，测试之间互不影响。
+    """
+    snapshots = {}
+    
+    def _form_after(steps, business_line='apple_store'):
+        key = (business_line, tuple(steps))
+        snapshot = snapshots.get(key)
+        if snapshot is None:
+            form = FormBasedDialogSystem(business_line)
+            form.process_batch(list(steps), None, semantic_mapper)
+            snapshot = snapshots[key] = pickle.dumps(form, protocol=pickle.HIGHEST_PROTOCOL)
+        return pickle.loads(snapshot)
+    
+    return _form_after
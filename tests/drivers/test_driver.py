@@ -16,6 +16,16 @@ from typing import Dict, List, Any, Optional, Callable
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+# 可选依赖处理
+try:
+    import coverage
+    COVERAGE_AVAILABLE = True
+except ImportError:
+    COVERAGE_AVAILABLE = False
+
+# 覆盖率统计范围：项目 src 目录
+_SOURCE_DIR = str(Path(__file__).resolve().parents[2] / "src")
+
 @dataclass
 class TestResult:
     """测试结果数据类"""
@@ -49,14 +59,15 @@ class TestSuite:
             self.tests = []
 
 class TestDriver:
-    def __init__(self, output_dir: str = None, formats: List[str] = None):
+    def __init__(self, output_dir: str = None, formats: List[str] = None, enable_coverage: bool = False):
         """
         Args:
             output_dir: 输出目录
             formats: 报告格式列表，默认为 ['text']
+            enable_coverage: 是否在运行测试时统计 src 的代码覆盖率（需安装 coverage 库）
         """
         self.output_dir = Path(output_dir) if output_dir else Path("test_reports")
-        self.output_dir.mkdir(exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
         self.formats = formats or ['text']
         
         self.test_suites: List[TestSuite] = []
@@ -64,6 +75,17 @@ class TestDriver:
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
         self.stats = {'total': 0, 'passed': 0, 'failed': 0, 'errors': 0}
+        
+        self.enable_coverage = enable_coverage
+        self.coverage_instance = None
+        if enable_coverage:
+            if COVERAGE_AVAILABLE:
+                self.coverage_instance = coverage.Coverage(
+                    source=[_SOURCE_DIR],
+                    data_file=str(self.output_dir / ".coverage")
+                )
+            else:
+                print("⚠️ 未安装 coverage 库，跳过覆盖率统计")
 
     def register_test_suite(self, suite: TestSuite):
         self.test_suites.append(suite)
@@ -72,14 +94,24 @@ class TestDriver:
         print(f"🚀 开始测试 (输出目录: {self.output_dir})")
         self.start_time = datetime.now()
         
+        if self.coverage_instance:
+            self.coverage_instance.start()
+        
         # 简要输出：只在终端显示进度
-        for suite in self.test_suites:
-            print(f"📦 套件: {suite.name} ({len(suite.tests)} 个用例)...", end="", flush=True)
-            self._run_test_suite(suite)
-            print(" 完成")
+        try:
+            for suite in self.test_suites:
+                print(f"📦 套件: {suite.name} ({len(suite.tests)} 个用例)...", end="", flush=True)
+                self._run_test_suite(suite)
+                print(" 完成")
+        finally:
+            if self.coverage_instance:
+                self.coverage_instance.stop()
+                self.coverage_instance.save()
         
         self.end_time = datetime.now()
         self._calculate_stats()
+        if self.coverage_instance:
+            self.stats['coverage'] = self.coverage_instance.report(file=io.StringIO())
         
         # 生成报告
         if 'text' in self.formats: self._save_text_report()
@@ -60,9 +60,20 @@ from test_suites.test_intent_recommendation import get_intent_recommendation_tes
 from test_suites.test_business_scenarios import get_business_scenario_tests
 from test_suites.test_exception_handling import get_exception_handling_tests
 
-def main():
+def main(argv=None):
+    """测试入口，argv 为 None 时解析命令行参数（CI 可在进程内直接调用）"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='运行所有测试套件')
+    parser.add_argument('--verbose', action='store_true', help='输出详细日志')
+    parser.add_argument('--output', default='test_reports', help='报告输出目录')
+    # run_coverage.py 会传入以下参数；异常处理套件始终注册，覆盖率由调用方统计，这里仅接受不处理
+    parser.add_argument('--include-exceptions', action='store_true', help='包含异常处理套件（默认已包含）')
+    parser.add_argument('--no-coverage', action='store_true', help='不在本脚本内统计覆盖率（默认即不统计）')
+    args = parser.parse_args(argv)
+    
     # 初始化驱动，指定只生成 text 格式
-    driver = TestDriver(output_dir='test_reports', formats=['text'])
+    driver = TestDriver(output_dir=args.output, formats=['text'])
     
     # 注册所有套件
     driver.register_test_suite(get_core_system_tests())
@@ -73,7 +84,7 @@ def main():
     driver.register_test_suite(get_exception_handling_tests())
     
     # 运行
-    result = driver.run_all_tests()
+    result = driver.run_all_tests(verbose=args.verbose)
     
     # 退出码
     if result['stats']['failed'] > 0 or result['stats']['errors'] > 0:
@@ -0,0 +1,71 @@
+"""
+测试桩调用记录 (Call Records)
+
+目的：
+1. 用紧凑的 __slots__ 冻结数据类替代每次调用分配的字典
+2. 保留按键读取（record["user_input"] / record.get(...)）的兼容性
+
+设计：
+- CallRecord：实现只读Mapping协议的基类，子类声明键名到字段名的映射
+- 各测试桩按需定义具体的记录类型
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, ClassVar, Dict, Optional
+
+
+class CallRecord(Mapping):
+    """
+    调用记录基类
+
+    子类通过 _KEYS 声明对外暴露的键名与字段名的对应关系，
+    使记录既能按属性访问，也能像旧版字典一样按键读取。
+    """
+
+    __slots__ = ()
+    _KEYS: ClassVar[Dict[str, str]] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, self._KEYS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+
+@dataclass(frozen=True, slots=True)
+class IntentCall(CallRecord):
+    """detect_intent 调用记录，可用意图以 frozenset 保存，不再复制键列表"""
+    user_input: str
+    intents: frozenset
+    context: Optional[Dict[str, Any]]
+
+    _KEYS: ClassVar[Dict[str, str]] = {
+        "user_input": "user_input",
+        "available_intents": "intents",
+        "context": "context",
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class SemanticCall(CallRecord):
+    """semantic_match 调用记录"""
+    method: str
+    user_input: str
+    options_count: int
+    context: Optional[Dict[str, Any]]
+    strategy: Optional[str] = None
+
+    _KEYS: ClassVar[Dict[str, str]] = {
+        "method": "method",
+        "user_input": "user_input",
+        "options_count": "options_count",
+        "context": "context",
+        "strategy": "strategy",
+    }
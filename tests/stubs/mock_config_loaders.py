@@ -13,10 +13,6 @@
 - 支持多种失败场景配置
 """
 
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 import json
@@ -13,12 +13,107 @@ LLM客户端测试桩 (Mock LLM Client Stub)
 - 记录所有调用历史便于测试验证
 """
 
+import re
 import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from core.interfaces import ILLMClient
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Optional, List, Tuple
+
+from .call_records import IntentCall
+
+
+# 预定义的关键词映射规则
+_KEYWORD_MAPPING = MappingProxyType({
+    'greeting': ('你好', '您好', 'hello', 'hi', '早上好', '下午好', '晚上好', '嗨'),
+    'product_query': (
+        '产品', '商品', '买', '购买', '价格', '多少钱', '有什么', '推荐', '型号',
+        '电脑', '手机', '笔记本', '苹果', '联想', '戴尔', 'mac', 'iphone',
+        'air', 'pro', '配置', '存储', '颜色', '芯片', '尺寸',
+        '1', '2', '3', '4', '5', '6', '7', '8', '9', '0'  # 数字选项
+    ),
+    'order_status': ('订单', '物流', '发货', '到哪里', '状态', '跟踪', '配送', '快递'),
+    'complaint': ('投诉', '抱怨', '不满意', '问题', '故障', '坏了', '质量', '差'),
+    'cart_operation': (
+        '购物车', '加入', '结算', '下单', '付款', '车', '重置', '清空',
+        '还是买', '换个', '不要', '取消'
+    ),
+    'confirmation': (
+        '是', '是的', '好的', '可以', '行', '没问题', '确定', '要',
+        '不', '不要', '不用', '否', '不是', '不需要', '再看看'
+    ),
+    'dining_query': (
+        '订餐', '预定', '预订', '订位', '包间', '餐厅', '吃饭', '就餐',
+        '火锅', '川菜', '粤菜', '西餐', '日料', '海底捞', '星巴克'
+    ),
+    'help': ('帮助', 'help', '怎么用', '使用说明', '功能'),
+})
+
+# 关键词匹配优先级（靠前者优先）
+# 意图名与阶段名统一驻留，可用意图/阶段的成员判断可直接按引用比较
+_PRIORITY_ORDER = tuple(map(sys.intern, (
+    'greeting',           # 问候优先级最高
+    'cart_operation',     # 购物车操作
+    'confirmation',       # 确认/否定
+    'dining_query',       # 餐饮查询
+    'product_query',      # 产品查询
+    'order_status',       # 订单状态
+    'complaint',          # 投诉
+    'help'               # 帮助
+)))
+_PRIORITY: Dict[str, int] = {intent: priority for priority, intent in enumerate(_PRIORITY_ORDER)}
+
+# 简单确认词：在购物车相关阶段直接识别为confirmation
+_SIMPLE_CONFIRM = frozenset(['是', '是的', '好的', '可以', '行', '不', '不要', '不用', '否', '不是'])
+_CART_STAGES = frozenset(map(sys.intern, ("completed", "cart_added", "viewing_cart", "checkout")))
+
+# 中文为主的输入无需大小写转换，只有出现ASCII大写字母时才调用lower()
+_ASCII_UPPER = re.compile(r'[A-Z]')
+
+
+class _KeywordMatcher:
+    """
+    限定意图集合的关键词匹配器
+    
+    每个意图的关键词编译为一个交替正则，按优先级顺序依次搜索，
+    第一个命中的意图即为结果；扫描在 re 的C实现中完成，不再逐字符走Python字典。
+    """
+    
+    __slots__ = ('searchers',)
+    
+    def __init__(self, searchers: Tuple[Tuple[Callable, str], ...]):
+        self.searchers = searchers
+    
+    def match(self, text: str) -> Optional[str]:
+        """返回文本中命中关键词的最高优先级意图，未命中返回None"""
+        for search, intent in self.searchers:
+            if search(text):
+                return intent
+        return None
+
+
+@lru_cache(maxsize=64)
+def _build_matcher(intents: frozenset) -> _KeywordMatcher:
+    """
+    构建仅包含指定意图关键词的匹配器
+    
+    按意图集合缓存，MockLLMClient及其子类的所有实例共享同一份编译结果。
+    
+    Args:
+        intents: 可用意图名称集合
+    
+    Returns:
+        关键词匹配器
+    """
+    # 不在优先级表中的意图不参与关键词匹配
+    ranked = sorted((intent for intent in intents if intent in _PRIORITY), key=_PRIORITY.__getitem__)
+    searchers = tuple(
+        (re.compile('|'.join(map(re.escape, _KEYWORD_MAPPING[intent]))).search, intent)
+        for intent in ranked
+        if _KEYWORD_MAPPING.get(intent)
+    )
+    return _KeywordMatcher(searchers)
 
 
 class MockLLMClient(ILLMClient):
@@ -40,32 +135,6 @@ class MockLLMClient(ILLMClient):
         self.fail_mode = fail_mode
         self.custom_responses = custom_responses or {}
         self.call_history = []  # 记录所有调用历史
-        
-        # 预定义的关键词映射规则
-        self.keyword_mapping = {
-            'greeting': ['你好', '您好', 'hello', 'hi', '早上好', '下午好', '晚上好', '嗨'],
-            'product_query': [
-                '产品', '商品', '买', '购买', '价格', '多少钱', '有什么', '推荐', '型号',
-                '电脑', '手机', '笔记本', '苹果', '联想', '戴尔', 'mac', 'iphone',
-                'air', 'pro', '配置', '存储', '颜色', '芯片', '尺寸',
-                '1', '2', '3', '4', '5', '6', '7', '8', '9', '0'  # 数字选项
-            ],
-            'order_status': ['订单', '物流', '发货', '到哪里', '状态', '跟踪', '配送', '快递'],
-            'complaint': ['投诉', '抱怨', '不满意', '问题', '故障', '坏了', '质量', '差'],
-            'cart_operation': [
-                '购物车', '加入', '结算', '下单', '付款', '车', '重置', '清空',
-                '还是买', '换个', '不要', '取消'
-            ],
-            'confirmation': [
-                '是', '是的', '好的', '可以', '行', '没问题', '确定', '要',
-                '不', '不要', '不用', '否', '不是', '不需要', '再看看'
-            ],
-            'dining_query': [
-                '订餐', '预定', '预订', '订位', '包间', '餐厅', '吃饭', '就餐',
-                '火锅', '川菜', '粤菜', '西餐', '日料', '海底捞', '星巴克'
-            ],
-            'help': ['帮助', 'help', '怎么用', '使用说明', '功能'],
-        }
     
     def detect_intent(
         self, 
@@ -84,12 +153,9 @@ class MockLLMClient(ILLMClient):
         Returns:
             识别到的意图名称，如果无法识别则返回'unknown'
         """
-        # 记录调用历史
-        self.call_history.append({
-            'user_input': user_input,
-            'available_intents': list(available_intents.keys()),
-            'context': context
-        })
+        # 记录调用历史（意图集合同时供匹配器缓存使用）
+        intents = frozenset(available_intents)
+        self.call_history.append(IntentCall(user_input, intents, context))
         
         # 模拟API失败
         if self.fail_mode:
@@ -100,10 +166,40 @@ class MockLLMClient(ILLMClient):
             return self.custom_responses[user_input]
         
         # 使用关键词匹配
-        detected_intent = self._match_by_keywords(user_input, available_intents, context)
+        detected_intent = self._match_by_keywords(user_input, intents, context)
         
         return detected_intent
     
+    def detect_intent_batch(
+        self,
+        user_inputs: List[str],
+        available_intents: Dict[str, str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        批量模拟意图识别，意图集合只构建一次
+        
+        Args:
+            user_inputs: 用户输入文本列表
+            available_intents: 可用意图字典 {意图名: 描述}
+            context: 对话上下文（可选，所有输入共用）
+        
+        Returns:
+            与输入一一对应的意图名称列表，逐条结果与 detect_intent 相同
+        """
+        intents = frozenset(available_intents)
+        self.call_history.extend(IntentCall(user_input, intents, context) for user_input in user_inputs)
+        
+        if self.fail_mode:
+            raise Exception("Mock LLM API failure")
+        
+        custom_responses = self.custom_responses
+        return [
+            custom_responses[user_input] if user_input in custom_responses
+            else self._match_by_keywords(user_input, intents, context)
+            for user_input in user_inputs
+        ]
+    
     def _match_by_keywords(
         self, 
         user_input: str, 
@@ -121,37 +217,21 @@ class MockLLMClient(ILLMClient):
         Returns:
             匹配的意图名称
         """
-        user_input_lower = user_input.lower().strip()
+        # 关键词均为小写ASCII或中文，仅在含ASCII大写字母时才需要转小写
+        user_input_lower = user_input.strip()
+        if _ASCII_UPPER.search(user_input_lower):
+            user_input_lower = user_input_lower.lower()
         
         # 特殊处理：简单确认词在特定阶段返回confirmation
-        simple_confirm_words = ['是', '是的', '好的', '可以', '行', '不', '不要', '不用', '否', '不是']
-        if user_input_lower in simple_confirm_words and context:
+        if user_input_lower in _SIMPLE_CONFIRM and context:
             stage = context.get("current_stage", "")
-            cart_related_stages = {"completed", "cart_added", "viewing_cart", "checkout"}
-            if stage in cart_related_stages and "confirmation" in available_intents:
+            if stage in _CART_STAGES and "confirmation" in available_intents:
                 return "confirmation"
         
-        # 遍历关键词映射，按优先级匹配
-        priority_order = [
-            'greeting',           # 问候优先级最高
-            'cart_operation',     # 购物车操作
-            'confirmation',       # 确认/否定
-            'dining_query',       # 餐饮查询
-            'product_query',      # 产品查询
-            'order_status',       # 订单状态
-            'complaint',          # 投诉
-            'help'               # 帮助
-        ]
-        
-        for intent in priority_order:
-            # 只匹配可用的意图
-            if intent not in available_intents:
-                continue
-            
-            keywords = self.keyword_mapping.get(intent, [])
-            for keyword in keywords:
-                if keyword in user_input_lower:
-                    return intent
+        # 按可用意图集合取缓存的匹配器，取命中关键词中优先级最高的意图
+        detected_intent = _build_matcher(frozenset(available_intents)).match(user_input_lower)
+        if detected_intent is not None:
+            return detected_intent
         
         # 未匹配到任何关键词，返回unknown
         return "unknown"
@@ -248,11 +328,7 @@ class ConfigurableMockLLMClient(MockLLMClient):
     ) -> str:
         """覆盖父类方法，支持序列响应"""
         # 记录调用
-        self.call_history.append({
-            'user_input': user_input,
-            'available_intents': list(available_intents.keys()),
-            'context': context
-        })
+        self.call_history.append(IntentCall(user_input, frozenset(available_intents), context))
         
         # 模拟延迟
         if self.simulate_delay:
@@ -267,6 +343,15 @@ class ConfigurableMockLLMClient(MockLLMClient):
         
         # 否则使用默认行为
         return super().detect_intent(user_input, available_intents, context)
+    
+    def detect_intent_batch(
+        self,
+        user_inputs: List[str],
+        available_intents: Dict[str, str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """逐条调用 detect_intent，保持响应序列与模拟延迟的语义"""
+        return [self.detect_intent(user_input, available_intents, context) for user_input in user_inputs]
 
 
 # 便捷工厂函数
@@ -283,10 +368,9 @@ def create_mock_llm_client(scenario: str = "normal") -> MockLLMClient:
     Returns:
         配置好的MockLLMClient实例
     """
-    scenarios = {
-        "normal": MockLLMClient(fail_mode=False),
-        "failure": MockLLMClient(fail_mode=True),
-        "custom": MockLLMClient()
-    }
-    
-    return scenarios.get(scenario, MockLLMClient())
\ No newline at end of file
+    # 只实例化所选场景的客户端；"custom"与未知场景均返回默认客户端
+    if scenario == "failure":
+        return MockLLMClient(fail_mode=True)
+    if scenario == "normal":
+        return MockLLMClient(fail_mode=False)
+    return MockLLMClient()
\ No newline at end of file
@@ -14,14 +14,12 @@
 - 记录所有调用历史便于测试验证
 """
 
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
-@dataclass
+from .call_records import SemanticCall
+
+@dataclass(slots=True)
 class MockSemanticResult:
     """模拟语义匹配结果"""
     chosen_index: Optional[int]
@@ -57,10 +55,12 @@ class MockSemanticMapper:
         self.fail_mode = fail_mode
         self.custom_results = custom_results or {}
         self.call_history = []
+        self._total_calls = 0           # 调用计数，统计信息无需遍历历史
+        self._semantic_match_calls = 0
         self.confidence_threshold = 0.6  # 默认置信度阈值
         
         # 预定义的匹配规则
-        self.default_rules = {
+        default_rules = {
             "高性能": MockSemanticResult(
                 chosen_index=2,  # M3 Pro
                 confidence=0.8,
@@ -92,6 +92,11 @@ class MockSemanticMapper:
                 strategy="keyword"
             )
         }
+        
+        # 规则表：{关键词: (匹配结果, 关键词字符集)}，字符集用于部分匹配
+        self.default_rules = {}
+        for keyword, result in default_rules.items():
+            self.add_custom_rule(keyword, result)
     
     def semantic_match(
         self,
@@ -111,12 +116,7 @@ class MockSemanticMapper:
             匹配结果
         """
         # 记录调用历史
-        self.call_history.append({
-            "method": "semantic_match",
-            "user_input": user_input,
-            "options_count": len(options),
-            "context": context
-        })
+        self._record_calls([SemanticCall("semantic_match", user_input, len(options), context)])
         
         # 模拟各种失败场景
         if self.fail_mode == "always_fail":
@@ -161,33 +161,57 @@ class MockSemanticMapper:
         """
         基于预定义规则进行匹配
         """
-        user_input_lower = user_input.lower().strip()
+        return self._match_batch_by_rules([user_input.lower().strip()], options)[0]
+    
+    def _match_batch_by_rules(
+        self,
+        texts: List[str],
+        options: List[Dict[str, Any]]
+    ) -> List[MockSemanticResult]:
+        """
+        对一批已转小写的输入进行规则匹配
+        
+        外层遍历规则（数量少）、内层遍历输入，每条输入保留首个命中的规则，
+        与逐条调用_match_by_rules的结果一致。
+        """
+        results: List[Optional[MockSemanticResult]] = [None] * len(texts)
+        option_count = len(options)
         
         # 优先匹配完全匹配的规则
-        for keyword, result in self.default_rules.items():
-            if keyword in user_input_lower:
-                # 检查索引是否在有效范围内
-                if result.chosen_index and result.chosen_index <= len(options):
-                    return result
+        for keyword, (result, _) in self.default_rules.items():
+            # 检查索引是否在有效范围内
+            if not (result.chosen_index and result.chosen_index <= option_count):
+                continue
+            for i, text in enumerate(texts):
+                if results[i] is None and keyword in text:
+                    results[i] = result
         
-        # 部分匹配
-        for keyword, result in self.default_rules.items():
-            if any(char in user_input_lower for char in keyword):
-                # 降低置信度
-                return MockSemanticResult(
-                    chosen_index=result.chosen_index,
-                    confidence=max(0.5, result.confidence - 0.2),
-                    reason=f"部分匹配：{keyword}",
-                    strategy="fallback"
+        for i, text in enumerate(texts):
+            if results[i] is not None:
+                continue
+            
+            # 部分匹配：输入与关键词有任一共同字符
+            input_chars = set(text)
+            for keyword, (result, keyword_chars) in self.default_rules.items():
+                if not input_chars.isdisjoint(keyword_chars):
+                    # 降低置信度
+                    results[i] = MockSemanticResult(
+                        chosen_index=result.chosen_index,
+                        confidence=max(0.5, result.confidence - 0.2),
+                        reason=f"部分匹配：{keyword}",
+                        strategy="fallback"
+                    )
+                    break
+            else:
+                # 无匹配
+                results[i] = MockSemanticResult(
+                    chosen_index=None,
+                    confidence=0.0,
+                    reason="无语义匹配",
+                    strategy="none"
                 )
         
-        # 无匹配
-        return MockSemanticResult(
-            chosen_index=None,
-            confidence=0.0,
-            reason="无语义匹配",
-            strategy="none"
-        )
+        return results
     
     def batch_match(
         self,
@@ -197,6 +221,49 @@ class MockSemanticMapper:
     ) -> List[MockSemanticResult]:
         """
         批量语义匹配
+        
+        失败模式只判断一次，规则匹配对整批输入一次完成；
+        会抛出异常或超时的失败模式仍逐条处理。
+        """
+        if self.fail_mode in ("random_error", "timeout"):
+            return self._batch_match_each(inputs, options, context)
+        
+        # 记录调用历史（与逐条调用semantic_match一致）
+        options_count = len(options)
+        self._record_calls([
+            SemanticCall("semantic_match", input_text, options_count, context)
+            for input_text in inputs
+        ])
+        
+        if self.fail_mode == "always_fail":
+            return [
+                MockSemanticResult(chosen_index=None, confidence=0.0, reason="模拟匹配失败", strategy="none")
+                for _ in inputs
+            ]
+        elif self.fail_mode == "low_confidence":
+            return [
+                MockSemanticResult(chosen_index=1, confidence=0.3, reason="模拟低置信度匹配", strategy="fallback")
+                for _ in inputs
+            ]
+        
+        # 自定义结果优先，其余输入统一走规则匹配
+        results = [self.custom_results.get(input_text) for input_text in inputs]
+        pending = [i for i, result in enumerate(results) if result is None]
+        matched = self._match_batch_by_rules(
+            [inputs[i].lower().strip() for i in pending], options
+        )
+        for i, result in zip(pending, matched):
+            results[i] = result
+        return results
+    
+    def _batch_match_each(
+        self,
+        inputs: List[str],
+        options: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[MockSemanticResult]:
+        """
+        逐条调用semantic_match的批量匹配，异常转为失败结果
         """
         results = []
         for input_text in inputs:
@@ -222,13 +289,19 @@ class MockSemanticMapper:
         self.custom_results[user_input] = result
     
     def add_custom_rule(self, keyword: str, result: MockSemanticResult):
-        """添加自定义匹配规则"""
-        self.default_rules[keyword] = result
+        """添加自定义匹配规则（同时缓存关键词字符集）"""
+        self.default_rules[keyword] = (result, frozenset(keyword))
     
     def set_confidence_threshold(self, threshold: float):
         """设置置信度阈值"""
         self.confidence_threshold = threshold
     
+    def _record_calls(self, calls: List[SemanticCall]):
+        """记录调用历史并更新计数"""
+        self.call_history.extend(calls)
+        self._total_calls += len(calls)
+        self._semantic_match_calls += sum(1 for call in calls if call.method == "semantic_match")
+    
     def get_call_history(self) -> List[Dict]:
         """获取调用历史"""
         return self.call_history
@@ -236,22 +309,20 @@ class MockSemanticMapper:
     def reset_history(self):
         """重置调用历史"""
         self.call_history = []
+        self._total_calls = 0
+        self._semantic_match_calls = 0
     
     def get_match_statistics(self) -> Dict[str, Any]:
         """获取匹配统计信息"""
-        if not self.call_history:
+        if not self._total_calls:
             return {"total_calls": 0}
         
-        total = len(self.call_history)
-        successful_matches = sum(1 for call in self.call_history if "semantic_match" in call.get("method", ""))
-        
         return {
-            "total_calls": total,
-            "successful_matches": successful_matches,
-            "success_rate": successful_matches / total if total > 0 else 0
+            "total_calls": self._total_calls,
+            "successful_matches": self._semantic_match_calls,
+            "success_rate": self._semantic_match_calls / self._total_calls
         }
 
-
 class ConfigurableMockSemanticMapper(MockSemanticMapper):
     """
     可配置的Mock语义映射器
@@ -304,13 +375,9 @@ class ConfigurableMockSemanticMapper(MockSemanticMapper):
     ) -> MockSemanticResult:
         """覆盖父类方法，支持序列结果和策略"""
         # 记录调用
-        self.call_history.append({
-            "method": "semantic_match",
-            "user_input": user_input,
-            "options_count": len(options),
-            "context": context,
-            "strategy": self.match_strategy
-        })
+        self._record_calls([SemanticCall(
+            "semantic_match", user_input, len(options), context, self.match_strategy
+        )])
         
         # 模拟延迟
         if self.simulate_delay:
@@ -324,8 +391,10 @@ class ConfigurableMockSemanticMapper(MockSemanticMapper):
             return result
         
         # 应用匹配策略
-        result = self._match_by_rules(user_input, options, context)
-        
+        return self._apply_strategy(self._match_by_rules(user_input, options, context))
+    
+    def _apply_strategy(self, result: MockSemanticResult) -> MockSemanticResult:
+        """按当前匹配策略调整规则匹配结果"""
         if self.match_strategy == "strict" and result.confidence < self.confidence_threshold:
             return MockSemanticResult(
                 chosen_index=None,
@@ -343,6 +412,32 @@ class ConfigurableMockSemanticMapper(MockSemanticMapper):
             )
         
         return result
+    
+    def batch_match(
+        self,
+        inputs: List[str],
+        options: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[MockSemanticResult]:
+        """覆盖父类方法，支持序列结果和策略"""
+        # 结果序列与模拟延迟需要逐条处理
+        if self.simulate_delay or (self.result_sequence and self.current_index < len(self.result_sequence)):
+            return self._batch_match_each(inputs, options, context)
+        
+        # 记录调用
+        options_count = len(options)
+        self._record_calls([
+            SemanticCall("semantic_match", input_text, options_count, context, self.match_strategy)
+            for input_text in inputs
+        ])
+        
+        # 整批规则匹配后统一应用匹配策略
+        matched = self._match_batch_by_rules(
+            [input_text.lower().strip() for input_text in inputs], options
+        )
+        if self.match_strategy == "default":
+            return matched
+        return [self._apply_strategy(result) for result in matched]
 
 
 # 便捷工厂函数
@@ -360,14 +455,14 @@ def create_mock_semantic_mapper(scenario: str = "normal") -> MockSemanticMapper:
     Returns:
         配置好的MockSemanticMapper实例
     """
-    scenarios = {
-        "normal": MockSemanticMapper(),
-        "failure": MockSemanticMapper(fail_mode="always_fail"),
-        "low_confidence": MockSemanticMapper(fail_mode="low_confidence"),
-        "error": MockSemanticMapper(fail_mode="random_error")
+    # 只实例化所选场景的映射器，未知场景返回正常模式
+    fail_modes = {
+        "failure": "always_fail",
+        "low_confidence": "low_confidence",
+        "error": "random_error"
     }
     
-    return scenarios.get(scenario, MockSemanticMapper())
+    return MockSemanticMapper(fail_mode=fail_modes.get(scenario))
 
 
 def create_high_accuracy_mapper() -> MockSemanticMapper:
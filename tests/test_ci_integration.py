@@ -17,20 +17,27 @@ CI/CD集成测试脚本
 
 import sys
 import os
-import json
-import subprocess
 import time
-import xml.etree.ElementTree as ET
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from pathlib import Path
 
+# 可选依赖处理
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # 添加项目路径
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 sys.path.insert(0, os.path.join(project_root, 'src'))
 
-@dataclass
+@dataclass(slots=True)
 class CITestResult:
     """CI测试结果"""
     name: str
@@ -49,7 +56,9 @@ class CIEnvironmentManager:
     
     def _load_ci_config(self) -> Dict[str, Any]:
         """加载CI配置"""
-        config_file = os.path.join(project_root, "tests", "test_data", "ci_config.json")
+        from tests.test_config import load_json_cached
+        
+        config_file = Path(project_root, "tests", "test_data", "ci_config.json")
         
         default_config = {
             "environments": {
@@ -68,7 +77,7 @@ class CIEnvironmentManager:
                 "production": {
                     "timeout": 1200,
                     "coverage_threshold": 90,
-                    "parallel_jobs": 4,
+                    "parallel_jobs": "auto",
                     "fail_fast": False
                 }
             },
@@ -85,20 +94,34 @@ class CIEnvironmentManager:
             }
         }
         
-        if os.path.exists(config_file):
-            try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    user_config = json.load(f)
-                # 合并配置
-                default_config.update(user_config)
-            except Exception as e:
-                print(f"Warning: 无法加载CI配置文件: {e}")
+        try:
+            user_config = load_json_cached(config_file)
+            # 合并配置
+            default_config.update(user_config)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: 无法加载CI配置文件: {e}")
         
         return default_config
     
     def get_environment_config(self) -> Dict[str, Any]:
-        """获取当前环境配置"""
-        return self.config["environments"].get(self.environment, self.config["environments"]["test"])
+        """获取当前环境配置，parallel_jobs按本机CPU数解析（"auto"时预留2个核心，非法值回退为1）"""
+        env_config = dict(self.config["environments"].get(self.environment, self.config["environments"]["test"]))
+        
+        cpu_count = os.cpu_count() or 1
+        configured = env_config.get("parallel_jobs", 1)
+        if configured == "auto":
+            env_config["parallel_jobs"] = max(1, cpu_count - 2)
+        else:
+            if isinstance(configured, str) and configured.strip().isdigit():
+                configured = int(configured)
+            if isinstance(configured, bool) or not isinstance(configured, int) or configured < 1:
+                print(f"Warning: parallel_jobs 配置无效 ({configured!r})，使用默认值 1")
+                configured = 1
+            env_config["parallel_jobs"] = min(configured, cpu_count)
+        
+        return env_config
 
 class TestRunner:
     """测试运行器"""
@@ -106,9 +129,115 @@ class TestRunner:
     def __init__(self, environment: str = "test"):
         self.env_manager = CIEnvironmentManager(environment)
         self.results: List[CITestResult] = []
+        self._lock = threading.Lock()  # 并行调度时保护results和子进程列表
+        self._procs: List["subprocess.Popen"] = []
+        self._fail_fast = False
+        self._abort_event = threading.Event()  # 快速失败触发后置位，尚未开始的套件不再启动
+        # 可选测试脚本是否存在，只在初始化时探测一次
+        tests_dir = Path(project_root) / "tests"
+        self._have_security = (tests_dir / "test_security.py").is_file()
+        self._have_performance = (tests_dir / "test_performance.py").is_file()
+        
+    def run_test_suites(self, suite_names: List[str], parallel_jobs: int = 1, fail_fast: bool = False):
+        """按parallel_jobs并行运行测试套件，fail_fast时任一套件失败即中止其余套件"""
+        self._fail_fast = fail_fast
+        
+        # 各测试套件相互独立且主要阻塞在子进程上
+        with ThreadPoolExecutor(max_workers=parallel_jobs) as executor:
+            futures = [executor.submit(self.run_test_suite, suite) for suite in suite_names]
+            for future in as_completed(futures):
+                future.result()
+        
+        # 结果按完成顺序追加，报告前恢复为配置中的套件顺序
+        order = {name: i for i, name in enumerate(suite_names)}
+        with self._lock:
+            self.results.sort(key=lambda r: order.get(r.name, len(order)))
+    
+    def run_test_suite(self, suite_name: str) -> Optional[CITestResult]:
+        """运行测试套件并记录结果，快速失败已触发时不启动并返回None"""
+        result = self._dispatch(suite_name)
+        if result is None:
+            return None
+        
+        trigger = False
+        with self._lock:
+            if self._abort_event.is_set():
+                # 运行期间被其他套件的失败中止，不计为本套件失败
+                if result.status == "FAIL":
+                    result = CITestResult(
+                        name=suite_name,
+                        status="SKIP",
+                        duration=result.duration,
+                        error_message="快速失败模式已中止该测试套件"
+                    )
+            elif result.status == "FAIL" and self._fail_fast:
+                self._abort_event.set()
+                trigger = True
+            self.results.append(result)
+        
+        if trigger:
+            print(f"❌ 测试套件 {suite_name} 失败，启用快速失败模式，停止后续测试")
+            self.abort_all()
+        else:
+            print(f"   {suite_name}: {result.status}")
+        return result
+    
+    def _record(self, result: CITestResult):
+        """线程安全地记录测试结果"""
+        with self._lock:
+            self.results.append(result)
+    
+    def _run_command(self, cmd: List[str], timeout: float, abortable: bool = True) -> "subprocess.CompletedProcess":
+        """启动并跟踪子进程，使快速失败时可以终止仍在运行的测试"""
+        import subprocess
+        
+        with self._lock:
+            if abortable and self._abort_event.is_set():
+                raise RuntimeError("测试已因快速失败中止")
+            proc = subprocess.Popen(
+                cmd,
+                cwd=project_root,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            self._procs.append(proc)
+        
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+        finally:
+            with self._lock:
+                self._procs.remove(proc)
+        
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+    
+    def abort_all(self, grace_period: float = 2.0):
+        """终止所有仍在运行的测试子进程（先SIGTERM，超时后SIGKILL）"""
+        import subprocess
+        
+        with self._lock:
+            self._abort_event.set()
+            procs = list(self._procs)
+        
+        for proc in procs:
+            proc.terminate()
+        
+        deadline = time.time() + grace_period
+        for proc in procs:
+            try:
+                proc.wait(timeout=max(0, deadline - time.time()))
+            except subprocess.TimeoutExpired:
+                proc.kill()
+    
+    def _dispatch(self, suite_name: str) -> Optional[CITestResult]:
+        """运行测试套件（不修改共享状态，可并行调用），快速失败已触发时返回None"""
+        if self._abort_event.is_set():
+            return None
         
-    def run_test_suite(self, suite_name: str) -> CITestResult:
-        """运行测试套件"""
         print(f"🏃 运行测试套件: {suite_name}")
         
         start_time = time.time()
@@ -137,20 +266,13 @@ class TestRunner:
                 error_message=str(e)
             )
         
-        self.results.append(result)
         return result
     
     def _run_unit_tests(self) -> CITestResult:
         """运行单元测试"""
         cmd = ["python", "tests/run_all_tests.py", "--output=test_reports/ci"]
         
-        result = subprocess.run(
-            cmd,
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=self.env_manager.get_environment_config()["timeout"]
-        )
+        result = self._run_command(cmd, timeout=self.env_manager.get_environment_config()["timeout"])
         
         return CITestResult(
             name="unit_tests",
@@ -174,16 +296,10 @@ class TestRunner:
     
     def _run_security_tests(self) -> CITestResult:
         """运行安全测试"""
-        if os.path.exists(os.path.join(project_root, "tests", "test_security.py")):
+        if self._have_security:
             cmd = ["python", "tests/test_security.py", "--output=test_reports/ci"]
             
-            result = subprocess.run(
-                cmd,
-                cwd=project_root,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
+            result = self._run_command(cmd, timeout=300)
             
             return CITestResult(
                 name="security_tests",
@@ -203,16 +319,10 @@ class TestRunner:
     
     def _run_performance_tests(self) -> CITestResult:
         """运行性能测试"""
-        if os.path.exists(os.path.join(project_root, "tests", "test_performance.py")):
+        if self._have_performance:
             cmd = ["python", "tests/test_performance.py", "--iterations=50", "--output=test_reports/ci"]
             
-            result = subprocess.run(
-                cmd,
-                cwd=project_root,
-                capture_output=True,
-                text=True,
-                timeout=600
-            )
+            result = self._run_command(cmd, timeout=600)
             
             return CITestResult(
                 name="performance_tests", 
@@ -237,13 +347,8 @@ class TestRunner:
         cmd = ["python", "tests/run_coverage.py", f"--threshold={int(threshold)}", "--xml"]
         
         try:
-            result = subprocess.run(
-                cmd,
-                cwd=project_root,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
+            # 覆盖率检查在测试套件结束后进行，不受快速失败中止影响
+            result = self._run_command(cmd, timeout=300, abortable=False)
             
             coverage_result = CITestResult(
                 name="coverage_check",
@@ -254,7 +359,7 @@ class TestRunner:
                 error_message=result.stderr if result.returncode != 0 else ""
             )
             
-            self.results.append(coverage_result)
+            self._record(coverage_result)
             return coverage_result
             
         except Exception as e:
@@ -264,9 +369,16 @@ class TestRunner:
                 duration=0,
                 error_message=str(e)
             )
-            self.results.append(coverage_result)
+            self._record(coverage_result)
             return coverage_result
 
+def _write_xml_element(xml: "XMLGenerator", name: str, attrs: Dict[str, str], text: str = ""):
+    """写入一个只含文本内容的XML元素"""
+    xml.startElement(name, attrs)
+    if text:
+        xml.characters(text)
+    xml.endElement(name)
+
 class ReportGenerator:
     """CI报告生成器"""
     
@@ -274,64 +386,73 @@ class ReportGenerator:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
+    @classmethod
+    def _tally(cls, results: List[CITestResult]) -> Dict[str, Any]:
+        """一次遍历统计各状态数量与总耗时"""
+        counts = Counter()
+        total_duration = 0
+        for r in results:
+            counts[r.status] += 1
+            total_duration += r.duration
+        
+        return {
+            "total_tests": len(results),
+            "passed": counts["PASS"],
+            "failed": counts["FAIL"],
+            "skipped": counts["SKIP"],
+            "total_duration": total_duration
+        }
+    
     def generate_junit_xml(self, results: List[CITestResult]) -> str:
         """生成JUnit XML报告"""
-        # 创建根元素
-        testsuites = ET.Element("testsuites")
+        from xml.sax.saxutils import XMLGenerator
         
         # 统计信息
-        total_tests = len(results)
-        failures = sum(1 for r in results if r.status == "FAIL")
-        errors = 0
-        skipped = sum(1 for r in results if r.status == "SKIP")
-        time_total = sum(r.duration for r in results)
-        
-        testsuites.set("name", "CI Test Suite")
-        testsuites.set("tests", str(total_tests))
-        testsuites.set("failures", str(failures))
-        testsuites.set("errors", str(errors))
-        testsuites.set("skipped", str(skipped))
-        testsuites.set("time", str(time_total))
-        
-        # 创建测试套件
-        testsuite = ET.SubElement(testsuites, "testsuite")
-        testsuite.set("name", "CustomerServiceRobot")
-        testsuite.set("tests", str(total_tests))
-        testsuite.set("failures", str(failures))
-        testsuite.set("errors", str(errors))
-        testsuite.set("skipped", str(skipped))
-        testsuite.set("time", str(time_total))
-        
-        # 添加测试用例
-        for result in results:
-            testcase = ET.SubElement(testsuite, "testcase")
-            testcase.set("name", result.name)
-            testcase.set("classname", "CI.TestSuite")
-            testcase.set("time", str(result.duration))
-            
-            if result.status == "FAIL":
-                failure = ET.SubElement(testcase, "failure")
-                failure.set("message", result.error_message)
-                failure.text = result.stderr
-            elif result.status == "SKIP":
-                skipped_elem = ET.SubElement(testcase, "skipped")
-                skipped_elem.set("message", result.error_message)
-            
-            # 添加系统输出
-            if result.stdout:
-                system_out = ET.SubElement(testcase, "system-out")
-                system_out.text = result.stdout
-            
-            if result.stderr:
-                system_err = ET.SubElement(testcase, "system-err")
-                system_err.text = result.stderr
+        stats = self._tally(results)
+        
+        summary_attrib = {
+            "tests": str(stats["total_tests"]),
+            "failures": str(stats["failed"]),
+            "errors": "0",
+            "skipped": str(stats["skipped"]),
+            "time": str(stats["total_duration"])
+        }
         
-        # 生成XML文件
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         junit_file = self.output_dir / f"junit_results_{timestamp}.xml"
         
-        tree = ET.ElementTree(testsuites)
-        tree.write(junit_file, encoding='utf-8', xml_declaration=True)
+        # 流式写入XML文件，不在内存中构建完整的元素树
+        with open(junit_file, 'wb') as f:
+            xml = XMLGenerator(f, encoding='utf-8', short_empty_elements=True)
+            xml.startDocument()
+            xml.startElement("testsuites", {"name": "CI Test Suite", **summary_attrib})
+            xml.startElement("testsuite", {"name": "CustomerServiceRobot", **summary_attrib})
+            
+            # 添加测试用例
+            for result in results:
+                xml.startElement("testcase", {
+                    "name": result.name,
+                    "classname": "CI.TestSuite",
+                    "time": str(result.duration)
+                })
+                
+                if result.status == "FAIL":
+                    _write_xml_element(xml, "failure", {"message": result.error_message}, result.stderr)
+                elif result.status == "SKIP":
+                    _write_xml_element(xml, "skipped", {"message": result.error_message})
+                
+                # 添加系统输出
+                if result.stdout:
+                    _write_xml_element(xml, "system-out", {}, result.stdout)
+                
+                if result.stderr:
+                    _write_xml_element(xml, "system-err", {}, result.stderr)
+                
+                xml.endElement("testcase")
+            
+            xml.endElement("testsuite")
+            xml.endElement("testsuites")
+            xml.endDocument()
         
         print(f"📋 JUnit报告已生成: {junit_file}")
         return str(junit_file)
@@ -342,11 +463,9 @@ class ReportGenerator:
         summary_file = self.output_dir / f"ci_summary_{timestamp}.json"
         
         # 统计信息
-        total_tests = len(results)
-        passed = sum(1 for r in results if r.status == "PASS")
-        failed = sum(1 for r in results if r.status == "FAIL")
-        skipped = sum(1 for r in results if r.status == "SKIP")
-        total_duration = sum(r.duration for r in results)
+        stats = self._tally(results)
+        total_tests = stats["total_tests"]
+        passed = stats["passed"]
         
         summary = {
             "timestamp": timestamp,
@@ -354,10 +473,10 @@ class ReportGenerator:
             "summary": {
                 "total_tests": total_tests,
                 "passed": passed,
-                "failed": failed,
-                "skipped": skipped,
+                "failed": stats["failed"],
+                "skipped": stats["skipped"],
                 "success_rate": (passed / total_tests * 100) if total_tests > 0 else 0,
-                "total_duration": total_duration
+                "total_duration": stats["total_duration"]
             },
             "results": [
                 {
@@ -378,12 +497,27 @@ class ReportGenerator:
             ]
         }
         
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            summary_file.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+        else:
+            import json
+            with open(summary_file, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False)
         
         print(f"📊 CI摘要报告已生成: {summary_file}")
         return str(summary_file)
 
+_slack_session = None
+
+def _get_slack_session():
+    """获取复用连接的Slack会话（首次调用时创建，缺少requests时抛出ImportError）"""
+    global _slack_session
+    if _slack_session is None:
+        import requests
+        _slack_session = requests.Session()
+        _slack_session.headers.update({"Content-Type": "application/json"})
+    return _slack_session
+
 class NotificationSender:
     """通知发送器"""
     
@@ -399,19 +533,24 @@ class NotificationSender:
             return
         
         # 构建消息
-        total_tests = len(results)
-        passed = sum(1 for r in results if r.status == "PASS")
-        failed = len(failed_tests)
-        skipped = sum(1 for r in results if r.status == "SKIP")
+        stats = ReportGenerator._tally(results)
+        total_tests = stats["total_tests"]
+        passed = stats["passed"]
+        failed = stats["failed"]
+        skipped = stats["skipped"]
         
         status_icon = "✅" if failed == 0 else "❌"
-        message = f"{status_icon} CI测试结果\n"
-        message += f"总计: {total_tests}, 通过: {passed}, 失败: {failed}, 跳过: {skipped}\n"
+        lines = [
+            f"{status_icon} CI测试结果",
+            f"总计: {total_tests}, 通过: {passed}, 失败: {failed}, 跳过: {skipped}"
+        ]
         
         if failed_tests:
-            message += "\n失败的测试:\n"
-            for test in failed_tests:
-                message += f"- {test.name}: {test.error_message}\n"
+            lines.append("")
+            lines.append("失败的测试:")
+            lines.extend(f"- {test.name}: {test.error_message}" for test in failed_tests)
+        
+        message = "\n".join(lines) + "\n"
         
         # 发送Slack通知（如果配置了webhook）
         webhook_url = self.config.get("slack_webhook")
@@ -427,13 +566,12 @@ class NotificationSender:
     def _send_slack_notification(self, webhook_url: str, message: str):
         """发送Slack通知"""
         try:
-            import requests
             payload = {
                 "text": message,
                 "username": "CI Bot",
                 "icon_emoji": ":robot_face:"
             }
-            response = requests.post(webhook_url, json=payload, timeout=10)
+            response = _get_slack_session().post(webhook_url, json=payload, timeout=10)
             if response.status_code == 200:
                 print("✅ Slack通知发送成功")
             else:
@@ -471,14 +609,8 @@ def main():
     # 运行测试套件
     test_suites = runner.env_manager.config["test_suites"]
     
-    for suite in test_suites:
-        result = runner.run_test_suite(suite)
-        
-        if result.status == "FAIL" and (args.fail_fast or env_config.get("fail_fast", False)):
-            print(f"❌ 测试套件 {suite} 失败，启用快速失败模式，停止后续测试")
-            break
-        
-        print(f"   {suite}: {result.status}")
+    fail_fast = args.fail_fast or env_config.get("fail_fast", False)
+    runner.run_test_suites(test_suites, env_config["parallel_jobs"], fail_fast)
     
     # 运行覆盖率检查
     runner.run_coverage_check(coverage_threshold)
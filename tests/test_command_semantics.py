@@ -1,30 +1,31 @@
+import re
 import sys, os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from core.form_based_system import FormBasedDialogSystem, OrderStatus, SlotStatus
-from semantics.option_mapping import SemanticMapper
+from core.form_based_system import OrderStatus, SlotStatus
 
 # 命令语义测试: reselect / restart / confirm
 
+# 回复中的提示词（任一出现即可）
+_CONFIRMED_RE = re.compile('✅|订单已确认')
+_RESELECT_PROMPT_RE = re.compile('请选择|修改|想改哪')
 
-def _fill_minimal_apple(form):
-    mapper = SemanticMapper()
-    form.process_input('电脑', None, mapper)
-    form.process_input('苹果', None, mapper)
-    form.process_input('MacBook Pro', None, mapper)
+
+def _fill_minimal_apple(form, mapper):
+    form.process_batch(['电脑', '苹果', 'MacBook Pro'], None, mapper)
     return mapper
 
 
-def test_apple_confirm_and_restart():
-    form = FormBasedDialogSystem('apple_store')
-    mapper = _fill_minimal_apple(form)
+def test_apple_confirm_and_restart(apple_store_form, semantic_mapper):
+    form = apple_store_form
+    mapper = _fill_minimal_apple(form, semantic_mapper)
     # 达到 READY_CONFIRM 状态
     assert form.order_status == OrderStatus.READY_CONFIRM
     # 确认下单
     resp = form.process_input('确认', None, mapper)
     assert form.order_confirmed is True
     assert form.order_status == OrderStatus.AWAITING_CONTINUE
-    assert '✅' in resp['response'] or '订单已确认' in resp['response']
+    assert _CONFIRMED_RE.search(resp['response'])
     # 继续购物（restart）
     resp2 = form.process_input('继续购物', None, mapper)
     assert form.order_confirmed is False
@@ -33,20 +34,16 @@ def test_apple_confirm_and_restart():
     assert form.last_prompted_slot in ['category', 'brand', 'series']
 
 
-def test_apple_reselect_flow():
-    form = FormBasedDialogSystem('apple_store')
-    mapper = _fill_minimal_apple(form)
+def test_apple_reselect_flow(apple_store_form, semantic_mapper):
+    form = apple_store_form
+    mapper = _fill_minimal_apple(form, semantic_mapper)
     assert form.order_status == OrderStatus.READY_CONFIRM
     # 触发重选
     resp = form.process_input('重选', None, mapper)
-    assert '请选择' in resp['response'] or '修改' in resp['response'] or '想改哪' in resp['response']
+    assert _RESELECT_PROMPT_RE.search(resp['response'])
     assert form.reselect_slot == 'waiting'
-    # 选择第1项 (category)
-    form.process_input('1', None, mapper)
-    # 重新输入新类别 手机
-    form.process_input('手机', None, mapper)
-    # 重新输入系列 iPhone 16 系列
-    form.process_input('iPhone 16 系列', None, mapper)
+    # 选择第1项 (category)，重新输入新类别 手机，再输入系列 iPhone 16 系列
+    form.process_batch(['1', '手机', 'iPhone 16 系列'], None, mapper)
     # READY_CONFIRM 再次出现
     assert form.order_status == OrderStatus.READY_CONFIRM
     # 再次确认
@@ -54,15 +51,11 @@ def test_apple_reselect_flow():
     assert form.order_confirmed is True
 
 
-def test_dining_confirm_flow():
-    form = FormBasedDialogSystem('dining')
-    mapper = SemanticMapper()
-    form.process_input('餐饮预订', None, mapper)
-    form.process_input('海底捞', None, mapper)
-    form.process_input('晚餐时段', None, mapper)
-    form.process_input('4人', None, mapper)
-    form.process_input('明天', None, mapper)
-    form.process_input('13800000000', None, mapper)  # 联系方式自由文本
+def test_dining_confirm_flow(dining_form, semantic_mapper):
+    form = dining_form
+    mapper = semantic_mapper
+    # 最后一项为联系方式自由文本
+    form.process_batch(['餐饮预订', '海底捞', '晚餐时段', '4人', '明天', '13800000000'], None, mapper)
     # 达到确认状态
     assert form.order_status == OrderStatus.READY_CONFIRM
     resp = form.process_input('确认', None, mapper)
@@ -73,7 +66,5 @@ def test_dining_confirm_flow():
     assert bye.get('should_exit') is True
 
 if __name__ == '__main__':
-    test_apple_confirm_and_restart()
-    test_apple_reselect_flow()
-    test_dining_confirm_flow()
-    print('command semantics tests passed')
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-x']))
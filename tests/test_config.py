@@ -7,8 +7,65 @@
 import json
 import configparser
 import os
+import pickle
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+# 可选依赖处理
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# 已解析JSON文件的缓存 {绝对路径: ((mtime_ns, size), pickle字节)}
+_JSON_CACHE: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
+
+
+def load_json_cached(json_file: Path) -> Any:
+    """
+    加载JSON文件，解析结果以pickle字节缓存在进程内存中
+    
+    缓存以源文件的(mtime_ns, size)校验，源文件未变化时直接反序列化缓存，
+    跳过JSON解析；每次反序列化得到独立的副本，调用方修改返回值不会影响缓存。
+    
+    Args:
+        json_file: JSON文件路径
+    
+    Returns:
+        解析后的JSON数据
+    """
+    json_file = Path(json_file)
+    stat = json_file.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    path = str(json_file.resolve())
+    
+    cached = _JSON_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return pickle.loads(cached[1])
+    
+    if ORJSON_AVAILABLE:
+        data = orjson.loads(json_file.read_bytes())
+    else:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    
+    _JSON_CACHE[path] = (key, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    return data
+
+
+def _coerce(value: str) -> Any:
+    """将配置字符串转换为bool/int/float，无法转换时原样返回"""
+    if value.lower() in ['true', 'false']:
+        return value.lower() == 'true'
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
 
 
 class TestConfigManager:
@@ -28,36 +85,29 @@ class TestConfigManager:
         self.config_file = self.config_dir / "test_config.ini"
         self.test_cases_file = self.config_dir / "test_cases.json"
         
-        # 加载配置
+        # 加载配置（文件不存在时read会直接跳过，无需先检查）
         self.config = configparser.ConfigParser()
-        if self.config_file.exists():
-            self.config.read(self.config_file, encoding='utf-8')
+        self.config.read(self.config_file, encoding='utf-8')
+        
+        # 预先转换所有配置值，get_config只需一次字典查找
+        self._flat: Dict[tuple, Any] = {
+            (section, key): _coerce(value)
+            for section in self.config.sections()
+            for key, value in self.config.items(section)
+        }
         
         # 加载测试用例
         self.test_cases = {}
-        if self.test_cases_file.exists():
-            try:
-                with open(self.test_cases_file, 'r', encoding='utf-8') as f:
-                    self.test_cases = json.load(f)
-            except json.JSONDecodeError as e:
-                print(f"警告: 测试用例文件格式错误: {e}")
+        try:
+            self.test_cases = load_json_cached(self.test_cases_file)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            print(f"警告: 测试用例文件格式错误: {e}")
     
     def get_config(self, section: str, key: str, default: Any = None) -> Any:
         """获取配置值"""
-        try:
-            value = self.config.get(section, key)
-            # 尝试转换类型
-            if value.lower() in ['true', 'false']:
-                return value.lower() == 'true'
-            try:
-                return int(value)
-            except ValueError:
-                try:
-                    return float(value)
-                except ValueError:
-                    return value
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            return default
+        return self._flat.get((section, self.config.optionxform(key)), default)
     
     def get_test_cases(self, category: str) -> List[Dict[str, Any]]:
         """获取指定类别的测试用例"""
@@ -3,8 +3,7 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from core.form_based_system import FormBasedDialogSystem, SlotStatus
-from semantics.option_mapping import SemanticMapper
+from core.form_based_system import SlotStatus
 
 
 class FakeLLMClient:
@@ -13,15 +12,14 @@ class FakeLLMClient:
         return {}
 
 
-def test_dining_intent_recommendation():
+def test_dining_intent_recommendation(dining_form, semantic_mapper):
     """验证餐饮预订的意图推荐"""
     print("\n" + "="*60)
     print("测试: 餐饮预订意图推荐")
     print("="*60)
     
-    form = FormBasedDialogSystem('dining')
+    form = dining_form
     llm = FakeLLMClient()
-    semantic_mapper = SemanticMapper()
     
     # 测试1: "火锅" → 海底捞
     print("\n测试1: 输入'想吃火锅'")
@@ -38,7 +36,8 @@ def test_dining_intent_recommendation():
     
     # 测试2: "晚上" → 晚餐时段
     print("\n测试2: 输入'晚上去'")
-    form2 = FormBasedDialogSystem('dining')
+    form2 = dining_form
+    form2.reset()
     form2.process_input('餐饮预订', llm, semantic_mapper)
     form2.process_input('海底捞', llm, semantic_mapper)
     form2.process_input('晚上去', llm, semantic_mapper)
@@ -50,7 +49,8 @@ def test_dining_intent_recommendation():
     
     # 测试3: "约会" → 2人
     print("\n测试3: 输入'和女朋友约会'")
-    form3 = FormBasedDialogSystem('dining')
+    form3 = dining_form
+    form3.reset()
     form3.process_input('餐饮预订', llm, semantic_mapper)
     form3.process_input('海底捞', llm, semantic_mapper)
     form3.process_input('晚餐时段', llm, semantic_mapper)
@@ -64,7 +64,8 @@ def test_dining_intent_recommendation():
     
     # 测试4: "明天" → 明天
     print("\n测试4: 输入'明天晚上'")
-    form4 = FormBasedDialogSystem('dining')
+    form4 = dining_form
+    form4.reset()
     form4.process_input('餐饮预订', llm, semantic_mapper)
     form4.process_input('海底捞', llm, semantic_mapper)
     form4.process_input('晚餐时段', llm, semantic_mapper)
@@ -82,4 +83,5 @@ def test_dining_intent_recommendation():
 
 
 if __name__ == '__main__':
-    test_dining_intent_recommendation()
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-x']))
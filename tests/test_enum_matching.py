@@ -1,14 +1,19 @@
+import re
 import sys, os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from core.form_based_system import FormBasedDialogSystem, SlotStatus
-from semantics.option_mapping import SemanticMapper
+import pytest
+
+from core.form_based_system import SlotStatus
+
+# 歧义/无法唯一匹配时回复中可能出现的提示词
+_AMBIGUOUS_RE = re.compile('多个可能匹配|歧义|无该选项|请更具体')
 
 # 测试: 纯数字选择 + 唯一匹配
 
-def test_numeric_selection_series():
-    form = FormBasedDialogSystem('apple_store')
-    mapper = SemanticMapper()
+def test_numeric_selection_series(apple_store_form, semantic_mapper):
+    form = apple_store_form
+    mapper = semantic_mapper
     # 触发系列提示
     form.process_input('我要买电脑', None, mapper)
     # 先提示品牌
@@ -20,41 +25,39 @@ def test_numeric_selection_series():
     assert form.current_form['series'].status == SlotStatus.FILLED
 
 
-def test_unique_match_storage():
-    form = FormBasedDialogSystem('apple_store')
-    mapper = SemanticMapper()
-    # 填必填槽位: 类别 -> 品牌 -> 系列
-    form.process_input('我要买电脑', None, mapper)
-    form.process_input('苹果', None, mapper)
-    form.process_input('MacBook Pro', None, mapper)
+@pytest.fixture
+def macbook_pro_form(form_after):
+    """已选定 MacBook Pro 系列的苹果商店表单（存储/颜色测试的公共前缀，取自快照）"""
+    return form_after(('我要买电脑', '苹果', 'MacBook Pro'))
+
+
+@pytest.mark.parametrize("text,expected", [
+    ('我想要1T', '1TB'),
+    ('需要2TB', '2TB'),
+])
+def test_unique_match_storage(macbook_pro_form, semantic_mapper, text, expected):
+    form = macbook_pro_form
     # 直接表达存储需求（不依赖当前提示槽位）
-    r = form.process_input('我想要1T', None, mapper)
+    r = form.process_input(text, None, semantic_mapper)
     assert form.current_form.get('storage') is not None
     assert form.current_form['storage'].value is not None
-    assert form.current_form['storage'].value.value == '1TB'
+    assert form.current_form['storage'].value.value == expected
 
-def test_ambiguous_storage():
-    form = FormBasedDialogSystem('apple_store')
-    mapper = SemanticMapper()
-    form.process_input('我要买电脑', None, mapper)
-    form.process_input('苹果', None, mapper)
-    form.process_input('MacBook Pro', None, mapper)
+def test_ambiguous_storage(macbook_pro_form, semantic_mapper):
+    form = macbook_pro_form
     # 使用模糊数字表达 512 期望命中多个候选（若实现歧义提示）
-    resp = form.process_input('需要512', None, mapper)
+    resp = form.process_input('需要512', None, semantic_mapper)
     # 兼容实现：若当前不再提供歧义分支，至少不应错误填充非 512GB 值
     if form.current_form['storage'].status == SlotStatus.EMPTY:
-        assert ('多个可能匹配' in resp['response']) or ('歧义' in resp['response']) or ('无该选项' in resp['response']) or ('请更具体' in resp['response'])
+        assert _AMBIGUOUS_RE.search(resp['response'])
     else:
         # 若直接唯一匹配到 512GB 也接受
         assert form.current_form['storage'].value.value == '512GB'
 
 
-def test_unique_match_color_alias():
-    form = FormBasedDialogSystem('apple_store')
-    mapper = SemanticMapper()
-    form.process_input('我要买电脑', None, mapper)
-    form.process_input('苹果', None, mapper)
-    form.process_input('MacBook Pro', None, mapper)
+def test_unique_match_color_alias(macbook_pro_form, semantic_mapper):
+    form = macbook_pro_form
+    mapper = semantic_mapper
     form.process_input('我想要1T', None, mapper)
     # 颜色别名暗蓝 -> 可能期望映射到 "午夜色"；若别名未包含则测试需兼容
     r = form.process_input('我喜欢午夜', None, mapper)
@@ -63,8 +66,4 @@ def test_unique_match_color_alias():
     assert form.current_form['color'].value.value in ['午夜色', '银色', '深空灰', '星光色', '黑色', '白色', '蓝色', '自然钛色']
 
 if __name__ == '__main__':
-    test_numeric_selection_series()
-    test_unique_match_storage()
-    test_unique_match_color_alias()
-    test_ambiguous_storage()
-    print('enum matching tests passed')
+    raise SystemExit(pytest.main([__file__, '-x']))
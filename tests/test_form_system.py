@@ -1,9 +1,19 @@
+import re
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from core.form_based_system import FormBasedDialogSystem, SlotStatus, SlotValue
-from semantics.option_mapping import SemanticMapper
+from core.form_based_system import SlotStatus, SlotValue
+
+# 组合验证失败时回复中的提示词
+_VALIDATION_ERROR_RE = re.compile('不支持|不合法|调整')
+# 订单确认回复中应包含的摘要项
+_ORDER_SUMMARY_RE = re.compile('处理器|颜色')
+# 系列关键词表 (小写关键词, 系列, 置信度)，按优先级排列：pro 优先于 air
+_SERIES_KEYWORDS = (
+    ('pro', 'MacBook Pro', 0.8),
+    ('air', 'MacBook Air', 0.75),
+)
 
 
 class FakeLLMClient:
@@ -16,18 +26,17 @@ class FakeLLMClient:
         result = {}
         text = user_input.lower()
         # 模拟系列抽取
-        if 'pro' in text:
-            result['series'] = {"value": "MacBook Pro", "confidence": 0.8, "reason": "关键词 pro"}
-        elif 'air' in text:
-            result['series'] = {"value": "MacBook Air", "confidence": 0.75, "reason": "关键词 air"}
+        for keyword, series, confidence in _SERIES_KEYWORDS:
+            if keyword in text:
+                result['series'] = {"value": series, "confidence": confidence, "reason": f"关键词 {keyword}"}
+                break
         # 模拟当用户说确认不再抽取
         return result
 
 
-def test_multi_slot_extraction_and_completion():
-    form = FormBasedDialogSystem('apple_store')
+def test_multi_slot_extraction_and_completion(apple_store_form, semantic_mapper):
+    form = apple_store_form
     llm = FakeLLMClient()
-    semantic_mapper = SemanticMapper()
 
     # 输入同时包含尺寸 芯片 颜色 系列（系列通过 llm）
     text = '我要16寸 MacBook Pro M3 Max 银色 1TB'
@@ -43,10 +52,9 @@ def test_multi_slot_extraction_and_completion():
     assert series_slot.value is None or series_slot.value.value in ['MacBook Pro']  # 可能还未填因为系列不是直接映射
 
 
-def test_conflict_resolution_flow():
-    form = FormBasedDialogSystem('apple_store')
+def test_conflict_resolution_flow(apple_store_form, semantic_mapper):
+    form = apple_store_form
     llm = FakeLLMClient()
-    semantic_mapper = SemanticMapper()
 
     # 初次填入颜色银色
     form.process_input('我要银色的电脑', llm, semantic_mapper)
@@ -61,10 +69,9 @@ def test_conflict_resolution_flow():
     assert form.awaiting_conflict_slot is None
 
 
-def test_validation_errors():
-    form = FormBasedDialogSystem('apple_store')
+def test_validation_errors(apple_store_form, semantic_mapper):
+    form = apple_store_form
     llm = FakeLLMClient()
-    semantic_mapper = SemanticMapper()
 
     # 填充必须槽位（除了 series 先填完其它）
     form.process_input('我要电脑 M3 1TB 深空灰', llm, semantic_mapper)
@@ -80,13 +87,12 @@ def test_validation_errors():
         final_resp = r['response']
     # 如果完成且验证失败应该出现错误提示
     if form._check_form_completeness():
-        assert ('不支持' in final_resp) or ('不合法' in final_resp) or ('调整' in final_resp)
+        assert _VALIDATION_ERROR_RE.search(final_resp)
 
 
-def test_order_confirmation():
-    form = FormBasedDialogSystem('apple_store')
+def test_order_confirmation(apple_store_form, semantic_mapper):
+    form = apple_store_form
     llm = FakeLLMClient()
-    semantic_mapper = SemanticMapper()
     # 一次性提供大部分信息（系列由 llm 抽取）
     form.process_input('我要16寸 MacBook Pro M3 Pro 银色 512GB', llm, semantic_mapper)
     # 确认完成并下单
@@ -94,13 +100,12 @@ def test_order_confirmation():
     resp = form.process_input('确认', llm, semantic_mapper)
     assert '订单已确认' in resp['response']
     assert form.order_confirmed is True
-    assert '处理器' in resp['response'] or '颜色' in resp['response']
+    assert _ORDER_SUMMARY_RE.search(resp['response'])
 
 
-def test_numeric_selection():
-    form = FormBasedDialogSystem('apple_store')
+def test_numeric_selection(apple_store_form, semantic_mapper):
+    form = apple_store_form
     llm = FakeLLMClient()
-    semantic_mapper = SemanticMapper()
     # 获取初始提示并确认已设置首个槽位
     initial_prompt = form.get_initial_prompt()
     assert form.last_prompted_slot is not None
@@ -114,12 +119,28 @@ def test_numeric_selection():
         form.process_input('2', llm, semantic_mapper)  # 选择第二个选项（如果存在）
         assert form.current_form[next_slot].status in (SlotStatus.FILLED, SlotStatus.PARTIAL)
     # 至少有一个必填槽位被填充
-    filled_required = [name for name, s in form.current_form.items() if s.definition.required and s.status == SlotStatus.FILLED]
-    assert len(filled_required) >= 1
+    assert len(form.filled_required_names) >= 1
+
+
+def test_filled_required_names_tracks_status(apple_store_form, semantic_mapper):
+    form = apple_store_form
+    llm = FakeLLMClient()
+
+    def scanned():
+        return {name for name, s in form.current_form.items() if s.definition.required and s.status == SlotStatus.FILLED}
+
+    assert form.filled_required_names == set()
+    form.process_input('我要16寸 MacBook Pro M3 Pro 银色 512GB', llm, semantic_mapper)
+    assert form.filled_required_names == scanned()
+    assert form._check_form_completeness() == (len(scanned()) == form.required_slot_count)
+    # 重选会清空槽位及其下游依赖
+    form.process_input('重选', llm, semantic_mapper)
+    form.process_input('1', llm, semantic_mapper)
+    assert form.filled_required_names == scanned()
+    form.reset()
+    assert form.filled_required_names == set()
 
 
 if __name__ == '__main__':
-    test_multi_slot_extraction_and_completion()
-    test_conflict_resolution_flow()
-    test_validation_errors()
-    print('表单系统测试完成')
\ No newline at end of file
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-x']))
@@ -16,24 +16,45 @@
 
 import sys
 import os
+import gc
 import time
 import threading
-import json
-import statistics
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any
+import pickle
+import tracemalloc
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import chain, cycle, islice
+from typing import List, Dict, Any, Optional, Sequence
 from dataclasses import dataclass, asdict
 
+# 可选依赖处理
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+    _PROCESS = psutil.Process()
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    _PROCESS = None
+
 # 添加项目路径
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 sys.path.insert(0, os.path.join(project_root, 'src'))
 
-# 导入时使用try-catch处理可能的导入错误
+# 导入时使用try-catch处理可能的导入错误；各依赖分别导入，
+# 一个模块缺失不会让其余模块（尤其是被测的 MockLLMClient）也退回到最小实现
 try:
     from parser.dsl_parser import DSLParser
     from interpreter.interpreter import DSLInterpreter
-    from stubs.mock_llm_client import MockLLMClient
 except ImportError as e:
     print(f"Warning: 导入模块失败: {e}")
     # 创建最小实现以便测试框架正常运行
@@ -46,13 +67,59 @@ except ImportError as e:
             self.parsed_dsl = parsed_dsl
         
         def execute(self, intent, context):
-            return ["测试响应"]
+            yield "测试响应"
+
+try:
+    from stubs.mock_llm_client import MockLLMClient
+except ImportError as e:
+    print(f"Warning: 导入模块失败: {e}")
     
     class MockLLMClient:
         def detect_intent(self, user_input, available_intents):
             return "test"
+        
+        def detect_intent_batch(self, user_inputs, available_intents):
+            return [self.detect_intent(x, available_intents) for x in user_inputs]
+        
+        def reset_history(self):
+            pass
+
+# DSL 生成模板：一条规则整体格式化一次，而不是逐行追加
+_INTENT_TEMPLATE = 'INTENT intent_{i}: "意图{i}描述"'
+_RULE_TEMPLATE = (
+    'RULE rule_{i}\n'
+    'WHEN INTENT_IS intent_{j}\n'
+    'THEN\n'
+    '    RESPOND "响应{i}"\n'
+    '    SET_VARIABLE "var_{i}" "value_{i}"\n'
+)
+
+def _time_buffer(size: int) -> array:
+    """预分配定长的 int64 纳秒耗时缓冲区，循环内按下标写入，避免逐次 append 与浮点对象分配"""
+    return array('q', bytes(8 * size))
+
+def _progress_checkpoints(iterations: int) -> frozenset:
+    """预先算出每完成 10% 时的迭代下标，循环内只做集合查找"""
+    return frozenset(iterations * k // 10 - 1 for k in range(1, 11)) - {-1}
 
-@dataclass
+def _quantile(sorted_times: Sequence[float], i: int, n: int) -> float:
+    """
+    在已排序数据上取第 i 个 n 分位点，插值方式与 statistics.quantiles 默认的 exclusive 一致，
+    多个分位点共用一次排序
+    """
+    ld = len(sorted_times)
+    m = ld + 1
+    j = i * m // n
+    j = 1 if j < 1 else ld - 1 if j > ld - 1 else j
+    delta = i * m - j * n
+    return (sorted_times[j - 1] * (n - delta) + sorted_times[j] * delta) / n
+
+@lru_cache(maxsize=16)
+def _cached_parse(parser, dsl_content: str):
+    """按 (解析器, DSL文本) 记忆化解析结果，相同输入只真正解析一次"""
+    return parser.parse(dsl_content)
+
+@dataclass(slots=True, frozen=True)
 class PerformanceResult:
     """性能测试结果数据类"""
     test_name: str
@@ -65,6 +132,7 @@ class PerformanceResult:
     p99_time: float
     throughput: float  # ops per second
     memory_usage: Dict[str, float] = None
+    peak_alloc: int = None  # 单次调用的峰值内存分配 (bytes)，由 tracemalloc 测得
     
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -76,25 +144,58 @@ class PerformanceMonitor:
         self.results: List[PerformanceResult] = []
         
     def time_function(self, func, *args, **kwargs):
-        """测量函数执行时间"""
-        start_time = time.perf_counter()
+        """测量函数执行时间，返回 (纳秒耗时, 函数结果)"""
+        start_ns = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.perf_counter()
-        return end_time - start_time, result
+        return time.perf_counter_ns() - start_ns, result
+    
+    def peak_allocation(self, func, *args, **kwargs) -> int:
+        """
+        在计时循环之外单独执行一次并用 tracemalloc 记录峰值分配 (bytes)，
+        避免内存追踪的开销混入耗时统计
+        """
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    
+    def build_result(self, test_name: str, execution_times: Sequence[int],
+                     total_time: float = None, peak_alloc: int = None) -> PerformanceResult:
+        """
+        由单次纳秒耗时汇总统计结果，报告中的时间统一换算为秒；
+        total_time（秒）缺省为各次耗时之和
+        """
+        sorted_times = sorted(execution_times)
+        count = len(sorted_times)
+        total_ns = sum(sorted_times)
+        if total_time is None:
+            total_time = total_ns / 1e9
+        return PerformanceResult(
+            test_name=test_name,
+            iterations=count,
+            total_time=total_time,
+            avg_time=total_ns / count / 1e9,
+            min_time=sorted_times[0] / 1e9,
+            max_time=sorted_times[-1] / 1e9,
+            p95_time=_quantile(sorted_times, 95, 100) / 1e9,
+            p99_time=_quantile(sorted_times, 99, 100) / 1e9,
+            throughput=count / total_time,
+            memory_usage=self.get_memory_usage(),
+            peak_alloc=peak_alloc
+        )
     
     def get_memory_usage(self):
         """获取当前内存使用情况"""
-        try:
-            import psutil
-            process = psutil.Process()
-            memory_info = process.memory_info()
-            return {
-                'rss': memory_info.rss / 1024 / 1024,  # MB
-                'vms': memory_info.vms / 1024 / 1024,  # MB
-                'percent': process.memory_percent()
-            }
-        except ImportError:
+        if not PSUTIL_AVAILABLE:
             return {'rss': 0, 'vms': 0, 'percent': 0}
+        memory_info = _PROCESS.memory_info()
+        return {
+            'rss': memory_info.rss / 1024 / 1024,  # MB
+            'vms': memory_info.vms / 1024 / 1024,  # MB
+            'percent': _PROCESS.memory_percent()
+        }
 
 class DSLPerformanceTester:
     """DSL解析性能测试器"""
@@ -117,34 +218,21 @@ class DSLPerformanceTester:
     
     def _generate_dsl(self, num_intents: int, num_rules: int) -> str:
         """生成指定规模的DSL内容"""
-        dsl_lines = []
-        
-        # 生成意图定义
-        for i in range(num_intents):
-            dsl_lines.append(f'INTENT intent_{i}: "意图{i}描述"')
-        
-        dsl_lines.append('')  # 空行分隔
-        
-        # 生成规则定义
-        for i in range(num_rules):
-            intent_idx = i % num_intents
-            dsl_lines.extend([
-                f'RULE rule_{i}',
-                f'WHEN INTENT_IS intent_{intent_idx}',
-                'THEN',
-                f'    RESPOND "响应{i}"',
-                f'    SET_VARIABLE "var_{i}" "value_{i}"',
-                ''
-            ])
-        
-        return '\n'.join(dsl_lines)
+        return '\n'.join(chain(
+            # 意图定义
+            (_INTENT_TEMPLATE.format(i=i) for i in range(num_intents)),
+            ('',),  # 空行分隔
+            # 规则定义，每条规则以空行结尾
+            (_RULE_TEMPLATE.format(i=i, j=i % num_intents) for i in range(num_rules)),
+        ))
     
     def test_parsing_performance(self, size: str = 'medium', iterations: int = 100) -> PerformanceResult:
         """测试DSL解析性能"""
         print(f"\n🚀 测试DSL解析性能 ({size}规模, {iterations}次迭代)...")
         
         dsl_content = self.test_dsls[size]
-        execution_times = []
+        execution_times = _time_buffer(iterations)
+        checkpoints = _progress_checkpoints(iterations)
         
         # 预热
         for _ in range(5):
@@ -152,35 +240,37 @@ class DSLPerformanceTester:
         
         # 实际测试
         for i in range(iterations):
-            exec_time, _ = self.monitor.time_function(self.parser.parse, dsl_content)
-            execution_times.append(exec_time)
+            exec_ns, _ = self.monitor.time_function(self.parser.parse, dsl_content)
+            execution_times[i] = exec_ns
             
-            if (i + 1) % (iterations // 10) == 0:
+            if i in checkpoints:
                 print(f"  进度: {(i+1)/iterations*100:.0f}%")
         
         # 统计结果
-        total_time = sum(execution_times)
-        avg_time = statistics.mean(execution_times)
-        min_time = min(execution_times)
-        max_time = max(execution_times)
-        p95_time = statistics.quantiles(execution_times, n=20)[18]  # 95th percentile
-        p99_time = statistics.quantiles(execution_times, n=100)[98]  # 99th percentile
-        throughput = iterations / total_time
-        
-        result = PerformanceResult(
-            test_name=f"DSL解析性能_{size}",
-            iterations=iterations,
-            total_time=total_time,
-            avg_time=avg_time,
-            min_time=min_time,
-            max_time=max_time,
-            p95_time=p95_time,
-            p99_time=p99_time,
-            throughput=throughput,
-            memory_usage=self.monitor.get_memory_usage()
-        )
+        peak_alloc = self.monitor.peak_allocation(self.parser.parse, dsl_content)
+        result = self.monitor.build_result(f"DSL解析性能_{size}", execution_times, peak_alloc=peak_alloc)
+        
+        print(f"  ✅ 完成: 平均 {result.avg_time*1000:.2f}ms, 吞吐量 {result.throughput:.1f} ops/sec")
+        return result
+    
+    def test_cached_parsing_performance(self, size: str = 'medium', iterations: int = 100) -> PerformanceResult:
+        """测试记忆化后的DSL解析性能（热路径），与 test_parsing_performance 的冷解析对照"""
+        print(f"\n🚀 测试DSL缓存解析性能 ({size}规模, {iterations}次迭代)...")
+        
+        dsl_content = self.test_dsls[size]
+        execution_times = _time_buffer(iterations)
+        
+        # 预热：首次调用完成真正的解析并写入缓存
+        _cached_parse(self.parser, dsl_content)
+        
+        for i in range(iterations):
+            exec_ns, _ = self.monitor.time_function(_cached_parse, self.parser, dsl_content)
+            execution_times[i] = exec_ns
+        
+        peak_alloc = self.monitor.peak_allocation(_cached_parse, self.parser, dsl_content)
+        result = self.monitor.build_result(f"DSL缓存解析性能_{size}", execution_times, peak_alloc=peak_alloc)
         
-        print(f"  ✅ 完成: 平均 {avg_time*1000:.2f}ms, 吞吐量 {throughput:.1f} ops/sec")
+        print(f"  ✅ 完成: 平均 {result.avg_time*1000:.4f}ms, 吞吐量 {result.throughput:.1f} ops/sec")
         return result
 
 class IntentRecognitionTester:
@@ -203,108 +293,190 @@ class IntentRecognitionTester:
             "order_status": "订单状态",
             "support": "技术支持"
         }
+        self.single_result: Optional[PerformanceResult] = None  # 逐条调用的结果，供批量测试对照
     
     def test_intent_recognition_performance(self, iterations: int = 100) -> PerformanceResult:
         """测试意图识别性能"""
         print(f"\n🎯 测试意图识别性能 ({iterations}次迭代)...")
         
-        execution_times = []
+        execution_times = _time_buffer(iterations)
+        checkpoints = _progress_checkpoints(iterations)
+        
+        # 清空调用记录，逐条与批量两组测试在相同的记录长度下计时
+        self.llm_client.reset_history()
         
         # 预热
-        for i in range(5):
-            test_input = self.test_inputs[i % len(self.test_inputs)]
+        for test_input in islice(cycle(self.test_inputs), 5):
             self.llm_client.detect_intent(test_input, self.available_intents)
         
-        # 实际测试  
-        for i in range(iterations):
-            test_input = self.test_inputs[i % len(self.test_inputs)]
-            exec_time, _ = self.monitor.time_function(
+        # 实际测试：循环取用测试输入
+        for i, test_input in zip(range(iterations), cycle(self.test_inputs)):
+            exec_ns, _ = self.monitor.time_function(
                 self.llm_client.detect_intent, 
                 test_input, 
                 self.available_intents
             )
-            execution_times.append(exec_time)
+            execution_times[i] = exec_ns
             
-            if (i + 1) % (iterations // 10) == 0:
+            if i in checkpoints:
                 print(f"  进度: {(i+1)/iterations*100:.0f}%")
         
         # 统计结果
-        total_time = sum(execution_times)
-        avg_time = statistics.mean(execution_times)
-        min_time = min(execution_times)
-        max_time = max(execution_times)
-        p95_time = statistics.quantiles(execution_times, n=20)[18]
-        p99_time = statistics.quantiles(execution_times, n=100)[98]
-        throughput = iterations / total_time
-        
-        result = PerformanceResult(
-            test_name="意图识别性能",
-            iterations=iterations,
-            total_time=total_time,
-            avg_time=avg_time,
-            min_time=min_time,
-            max_time=max_time,
-            p95_time=p95_time,
-            p99_time=p99_time,
-            throughput=throughput,
-            memory_usage=self.monitor.get_memory_usage()
+        peak_alloc = self.monitor.peak_allocation(
+            self.llm_client.detect_intent, self.test_inputs[0], self.available_intents
         )
+        result = self.monitor.build_result("意图识别性能", execution_times, peak_alloc=peak_alloc)
+        self.single_result = result
         
-        print(f"  ✅ 完成: 平均 {avg_time*1000:.2f}ms, 吞吐量 {throughput:.1f} ops/sec")
+        print(f"  ✅ 完成: 平均 {result.avg_time*1000:.2f}ms, 吞吐量 {result.throughput:.1f} ops/sec")
         return result
-
-class ConcurrencyTester:
-    """并发性能测试器"""
     
-    def __init__(self):
-        self.monitor = PerformanceMonitor()
-        self.parser = DSLParser()
-        self.llm_client = MockLLMClient()
+    def test_batch_intent_recognition_performance(self, iterations: int = 100) -> PerformanceResult:
+        """
+        测试批量意图识别性能，与逐条调用对照
+
+        每次迭代以 detect_intent_batch 处理整组测试输入，样本为该批次的单条平均耗时。
+        """
+        print(f"\n🎯 测试批量意图识别性能 ({iterations}批, 每批{len(self.test_inputs)}条)...")
         
-    def _worker_task(self, worker_id: int, requests_per_worker: int) -> List[float]:
-        """工作线程任务"""
-        execution_times = []
+        batch_size = len(self.test_inputs)
+        execution_times = _time_buffer(iterations)
         
-        dsl_content = """
+        self.llm_client.reset_history()
+        
+        # 预热
+        self.llm_client.detect_intent_batch(self.test_inputs, self.available_intents)
+        
+        for i in range(iterations):
+            exec_ns, _ = self.monitor.time_function(
+                self.llm_client.detect_intent_batch,
+                self.test_inputs,
+                self.available_intents
+            )
+            execution_times[i] = exec_ns // batch_size
+        
+        peak_alloc = self.monitor.peak_allocation(
+            self.llm_client.detect_intent_batch, self.test_inputs, self.available_intents
+        )
+        result = self.monitor.build_result("意图识别性能_批量", execution_times, peak_alloc=peak_alloc)
+        
+        print(f"  ✅ 完成: 单条平均 {result.avg_time*1000:.4f}ms, 吞吐量 {result.throughput:.1f} ops/sec")
+        if self.single_result and result.avg_time > 0:
+            print(f"  📊 相对逐条调用: {self.single_result.avg_time / result.avg_time:.2f}x")
+        return result
+
+# 并发测试使用的DSL内容，由主进程解析一次后分发给各工作者
+_CONCURRENCY_DSL = """
 INTENT product_query: "产品咨询"
 RULE test_rule
 WHEN INTENT_IS product_query
 THEN
     RESPOND "处理产品咨询"
 """
-        
+
+def _available_cpus() -> int:
+    """当前进程可用的CPU数，优先按CPU亲和性统计（容器或 taskset 限制下更准确）"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 4
+
+def _pin_to_cpu(worker_id: int):
+    """将当前进程绑定到可用CPU中的一个（仅Linux支持 sched_setaffinity，其余平台跳过）"""
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[worker_id % len(cpus)]})
+    except (AttributeError, OSError):
+        pass
+
+# 工作者共享的已解析DSL，由执行器的 initializer 在每个工作者启动时设置
+_WORKER_PARSED_DSL = None
+
+def _init_worker(parsed_dsl_bytes: bytes):
+    """执行器 initializer：反序列化主进程解析好的DSL，工作者内不再重复解析"""
+    global _WORKER_PARSED_DSL
+    _WORKER_PARSED_DSL = pickle.loads(parsed_dsl_bytes)
+
+def _worker_task(worker_id: int, requests_per_worker: int, pin_cpu: bool = False) -> array:
+    """
+    并发工作任务
+
+    定义在模块级以便进程池序列化；解释器与LLM客户端在工作者内部创建，
+    进程模式下每个子进程各自持有一份。pin_cpu 为 True 时将进程绑定到固定CPU，
+    测量循环期间关闭GC，减少调度抖动和回收停顿对尾延迟的影响。
+    """
+    if pin_cpu:
+        _pin_to_cpu(worker_id)
+    
+    llm_client = MockLLMClient()
+    execution_times = _time_buffer(requests_per_worker)
+    
+    # 解释器构建只做一次，请求循环测量稳态开销；冷解析开销由 DSLPerformanceTester 单独测量
+    interpreter = DSLInterpreter(_WORKER_PARSED_DSL)
+    
+    # GC开关是进程级的，线程模式下各工作者互相干扰，因此只在独立进程中关闭
+    gc_was_enabled = gc.isenabled()
+    if pin_cpu:
+        gc.disable()
+    try:
         for i in range(requests_per_worker):
-            # 模拟完整的请求处理流程
-            start_time = time.perf_counter()
-            
-            # DSL解析
-            parsed_dsl = self.parser.parse(dsl_content)
+            # 模拟请求处理流程
+            start_ns = time.perf_counter_ns()
             
             # 意图识别  
             user_input = f"worker_{worker_id}_request_{i}_产品咨询"
-            intent = self.llm_client.detect_intent(user_input, {"product_query": "产品咨询"})
+            intent = llm_client.detect_intent(user_input, {"product_query": "产品咨询"})
             
-            # DSL解释执行
-            interpreter = DSLInterpreter(parsed_dsl)
+            # DSL解释执行：逐条消费响应而不保留，execute 返回列表或生成器均可
             context = {"user_input": user_input}
-            responses = interpreter.execute(intent, context)
+            deque(interpreter.execute(intent, context), maxlen=0)
             
-            end_time = time.perf_counter()
-            execution_times.append(end_time - start_time)
-            
-        return execution_times
+            execution_times[i] = time.perf_counter_ns() - start_ns
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        
+    return execution_times
+
+class ConcurrencyTester:
+    """
+    并发性能测试器
+
+    默认使用进程池，使纯Python的解析/识别/解释工作真正并行；
+    executor='thread' 时改用线程池，用于观察GIL下的线程争用。
+    """
     
+    EXECUTORS = {
+        'process': ProcessPoolExecutor,
+        'thread': ThreadPoolExecutor,
+    }
+    
+    def __init__(self, executor: str = 'process'):
+        self.monitor = PerformanceMonitor()
+        self.executor_name = executor
+        self.executor_cls = self.EXECUTORS[executor]
+        # 只有独立的子进程才做CPU绑定，线程模式下绑定会影响整个测试进程
+        self.pin_cpu = executor == 'process'
+        
     def test_concurrent_performance(self, concurrent_users: int = 10, requests_per_user: int = 20) -> PerformanceResult:
         """测试并发处理性能"""
         print(f"\n⚡ 测试并发处理性能 ({concurrent_users}用户, 每用户{requests_per_user}请求)...")
+        cpus = _available_cpus()
+        print(f"  可用CPU: {cpus}, 执行器: {self.executor_name}")
+        if concurrent_users > cpus:
+            print("  ⚠️ 并发用户数超过可用CPU数，结果将包含调度争用开销")
         
-        all_execution_times = []
+        all_execution_times = array('q')
         start_time = time.perf_counter()
         
-        # 使用线程池执行并发测试
-        with ThreadPoolExecutor(max_workers=concurrent_users) as executor:
+        # DSL只在主进程解析一次，序列化后经 initializer 交给每个工作者
+        parsed_dsl_bytes = pickle.dumps(DSLParser().parse(_CONCURRENCY_DSL))
+        
+        # 使用进程池（或线程池）执行并发测试
+        with self.executor_cls(max_workers=concurrent_users, initializer=_init_worker,
+                               initargs=(parsed_dsl_bytes,)) as executor:
             futures = [
-                executor.submit(self._worker_task, worker_id, requests_per_user)
+                executor.submit(_worker_task, worker_id, requests_per_user, self.pin_cpu)
                 for worker_id in range(concurrent_users)
             ]
             
@@ -319,57 +491,13 @@ THEN
         total_time = end_time - start_time
         
         # 统计结果
-        total_requests = len(all_execution_times)
-        avg_time = statistics.mean(all_execution_times)
-        min_time = min(all_execution_times)
-        max_time = max(all_execution_times)
-        p95_time = statistics.quantiles(all_execution_times, n=20)[18]
-        p99_time = statistics.quantiles(all_execution_times, n=100)[98]
-        throughput = total_requests / total_time
-        
-        result = PerformanceResult(
-            test_name="并发处理性能",
-            iterations=total_requests,
-            total_time=total_time,
-            avg_time=avg_time,
-            min_time=min_time,
-            max_time=max_time,
-            p95_time=p95_time,
-            p99_time=p99_time,
-            throughput=throughput,
-            memory_usage=self.monitor.get_memory_usage()
-        )
+        result = self.monitor.build_result("并发处理性能", all_execution_times, total_time)
         
-        print(f"  ✅ 完成: 平均 {avg_time*1000:.2f}ms, 并发吞吐量 {throughput:.1f} ops/sec")
+        print(f"  ✅ 完成: 平均 {result.avg_time*1000:.2f}ms, 并发吞吐量 {result.throughput:.1f} ops/sec")
         return result
 
-class PerformanceReporter:
-    """性能测试报告生成器"""
-    
-    def __init__(self, output_dir: str = "test_reports"):
-        self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
-    
-    def generate_report(self, results: List[PerformanceResult]):
-        """生成性能测试报告"""
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        
-        # 生成JSON报告
-        json_file = os.path.join(self.output_dir, f"performance_report_{timestamp}.json")
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump([result.to_dict() for result in results], f, indent=2, ensure_ascii=False)
-        
-        # 生成HTML报告
-        html_file = os.path.join(self.output_dir, f"performance_report_{timestamp}.html")
-        self._generate_html_report(results, html_file)
-        
-        print(f"\n📊 性能测试报告已生成:")
-        print(f"  JSON: {json_file}")
-        print(f"  HTML: {html_file}")
-    
-    def _generate_html_report(self, results: List[PerformanceResult], html_file: str):
-        """生成HTML格式的性能报告"""
-        html_content = f"""
+# HTML报告模板：页头、行模板与静态页尾在模块加载时构建一次，生成报告时按顺序写入文件
+_REPORT_HEAD_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -393,7 +521,7 @@ class PerformanceReporter:
     <div class="container">
         <div class="header">
             <h1>🚀 系统性能测试报告</h1>
-            <p>生成时间: {time.strftime("%Y-%m-%d %H:%M:%S")}</p>
+            <p>生成时间: {generated_at}</p>
         </div>
         
         <h2>📈 性能指标概览</h2>
@@ -407,28 +535,13 @@ class PerformanceReporter:
                     <th>P99响应时间 (ms)</th>
                     <th>吞吐量 (ops/sec)</th>
                     <th>内存使用 (MB)</th>
+                    <th>峰值分配 (KB)</th>
                 </tr>
             </thead>
             <tbody>
 """
-        
-        for result in results:
-            memory_usage = result.memory_usage['rss'] if result.memory_usage else 0
-            color_class = "good" if result.avg_time < 0.1 else "warning" if result.avg_time < 0.5 else "danger"
-            
-            html_content += f"""
-                <tr>
-                    <td>{result.test_name}</td>
-                    <td>{result.iterations:,}</td>
-                    <td class="{color_class}">{result.avg_time*1000:.2f}</td>
-                    <td>{result.p95_time*1000:.2f}</td>
-                    <td>{result.p99_time*1000:.2f}</td>
-                    <td>{result.throughput:.1f}</td>
-                    <td>{memory_usage:.1f}</td>
-                </tr>
-"""
-        
-        html_content += """
+
+_REPORT_TAIL = """
             </tbody>
         </table>
         
@@ -442,9 +555,78 @@ class PerformanceReporter:
     </div>
 </body>
 </html>"""
+
+_REPORT_ROW_TEMPLATE = """
+                <tr>
+                    <td>{test_name}</td>
+                    <td>{iterations:,}</td>
+                    <td class="{color_class}">{avg_ms:.2f}</td>
+                    <td>{p95_ms:.2f}</td>
+                    <td>{p99_ms:.2f}</td>
+                    <td>{throughput:.1f}</td>
+                    <td>{memory_usage:.1f}</td>
+                    <td>{peak_alloc}</td>
+                </tr>
+"""
+
+# 平均响应时间分档阈值（秒）与对应的样式类，按 bisect 查表
+_LATENCY_THRESHOLDS = (0.1, 0.5)
+_LATENCY_CLASSES = ("good", "warning", "danger")
+
+def _latency_class(avg_time: float) -> str:
+    """按平均响应时间返回报告中的样式类"""
+    return _LATENCY_CLASSES[bisect_right(_LATENCY_THRESHOLDS, avg_time)]
+
+def _render_report_row(result: PerformanceResult) -> str:
+    """渲染报告中的一行"""
+    return _REPORT_ROW_TEMPLATE.format(
+        test_name=result.test_name,
+        iterations=result.iterations,
+        color_class=_latency_class(result.avg_time),
+        avg_ms=result.avg_time * 1000,
+        p95_ms=result.p95_time * 1000,
+        p99_ms=result.p99_time * 1000,
+        throughput=result.throughput,
+        memory_usage=result.memory_usage['rss'] if result.memory_usage else 0,
+        peak_alloc=f"{result.peak_alloc / 1024:.1f}" if result.peak_alloc is not None else "-",
+    )
+
+class PerformanceReporter:
+    """性能测试报告生成器"""
+    
+    def __init__(self, output_dir: str = "test_reports"):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+    
+    def generate_report(self, results: List[PerformanceResult]):
+        """生成性能测试报告"""
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        
+        # 生成JSON报告
+        json_file = os.path.join(self.output_dir, f"performance_report_{timestamp}.json")
+        if ORJSON_AVAILABLE:
+            # orjson 原生序列化数据类，无需 asdict 深拷贝
+            with open(json_file, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            import json
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump([result.to_dict() for result in results], f, indent=2, ensure_ascii=False)
         
+        # 生成HTML报告
+        html_file = os.path.join(self.output_dir, f"performance_report_{timestamp}.html")
+        self._generate_html_report(results, html_file)
+        
+        print(f"\n📊 性能测试报告已生成:")
+        print(f"  JSON: {json_file}")
+        print(f"  HTML: {html_file}")
+    
+    def _generate_html_report(self, results: List[PerformanceResult], html_file: str):
+        """生成HTML格式的性能报告，页头、各行与页尾依次写入文件，不拼接整页字符串"""
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(_REPORT_HEAD_TEMPLATE.format(generated_at=time.strftime("%Y-%m-%d %H:%M:%S")))
+            f.writelines(map(_render_report_row, results))
+            f.write(_REPORT_TAIL)
 
 def main():
     """性能测试主入口"""
@@ -452,8 +634,11 @@ def main():
     
     parser = argparse.ArgumentParser(description='客服机器人系统性能测试')
     parser.add_argument('--iterations', type=int, default=100, help='单项测试迭代次数')
-    parser.add_argument('--concurrent-users', type=int, default=10, help='并发用户数')
+    parser.add_argument('--concurrent-users', type=int, default=min(10, _available_cpus() * 2),
+                        help='并发用户数（默认按可用CPU数取 min(10, 2×CPU)）')
     parser.add_argument('--requests-per-user', type=int, default=20, help='每用户请求数')
+    parser.add_argument('--executor', choices=sorted(ConcurrencyTester.EXECUTORS), default='process',
+                        help='并发测试使用的执行器')
     parser.add_argument('--output', default='test_reports', help='报告输出目录')
     
     args = parser.parse_args()
@@ -468,14 +653,16 @@ def main():
     for size in ['small', 'medium', 'large']:
         result = dsl_tester.test_parsing_performance(size, args.iterations)
         results.append(result)
+        results.append(dsl_tester.test_cached_parsing_performance(size, args.iterations))
     
     # 意图识别性能测试
     intent_tester = IntentRecognitionTester()
     result = intent_tester.test_intent_recognition_performance(args.iterations)
     results.append(result)
+    results.append(intent_tester.test_batch_intent_recognition_performance(args.iterations))
     
     # 并发性能测试
-    concurrent_tester = ConcurrencyTester()
+    concurrent_tester = ConcurrencyTester(args.executor)
     result = concurrent_tester.test_concurrent_performance(
         args.concurrent_users, 
         args.requests_per_user
@@ -19,9 +19,25 @@ import os
 import json
 import re
 import hashlib
+import mmap
 from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass
 
+# 可选依赖处理：RE2 保证线性时间匹配，对超长恶意载荷不会出现回溯爆炸
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# 扫描恶意载荷的正则引擎，缺少 RE2 时回退到标准库 re；
+# google-re2 模块没有 IGNORECASE 等标志常量，标志统一以内联 (?i)/(?s) 写在正则开头
+_scan_re = re2 if RE2_AVAILABLE else re
+
+# 与标准库 re 的 Unicode \s 等价的空白字符集（即 str.isspace()），逐字列出；
+# RE2 的 \s 只匹配 ASCII 空白，直接写 \s 会使两种引擎对全角空格等载荷给出不同结论
+_WHITESPACE = '[\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]'
+
 # 添加项目路径
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
@@ -42,6 +58,55 @@ except ImportError as e:
         def detect_intent(self, user_input, available_intents):
             return "unknown"
 
+# 安全扫描使用的正则在模块加载时编译一次，扫描循环中只做匹配
+# 危险内容特征（DSL注入检测），合并为一个交替正则，一次扫描即可判断是否命中任一特征；
+# 只有这里扫描任意长度的恶意载荷，安装了 RE2 时使用 RE2 保证线性时间
+_DANGEROUS_SOURCE = '(?is)' + '|'.join(f'(?:{pattern})' for pattern in (
+    r'<script.*?>.*?</script>',
+    r'javascript:',
+    rf'DROP{_WHITESPACE}+TABLE',
+    rf'DELETE{_WHITESPACE}+FROM',
+    rf'rm{_WHITESPACE}+-rf',
+    r'/etc/passwd',
+    r'%[nxsp]',
+    r'\x00'
+))
+_DANGEROUS_PATTERN = _scan_re.compile(_DANGEROUS_SOURCE)
+
+# 敏感数据特征 {类型: 正则}；依赖 \b 的 Unicode 语义（中文字符也算单词字符），始终使用标准库 re，
+# 检测结论不随是否安装 RE2 而变化
+_SENSITIVE_SOURCES = {
+    'phone_number': r'\b1[3-9]\d{9}\b',
+    'id_card': r'\b\d{15}|\d{18}\b',
+    'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    'credit_card': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
+    'api_key': r'[A-Za-z0-9]{32,}',
+    'password': r'password\s*[:=]\s*[\'"]?([^\s\'"]+)',
+}
+_SENSITIVE_PATTERNS = {data_type: re.compile(pattern, re.IGNORECASE) for data_type, pattern in _SENSITIVE_SOURCES.items()}
+# 合并后的预检正则：不含任何敏感特征的文本一次扫描即可排除；
+# 命中后仍逐类确认，因为同一段文本可能同时属于多种类型（如身份证号与长数字密钥），单次扫描会漏报
+_SENSITIVE_ANY = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern in _SENSITIVE_SOURCES.values()), re.IGNORECASE
+)
+
+# 配置文件安全检查项 (正则, 问题描述)，按字节编译，直接扫描内存映射的文件内容而无需解码
+_CONFIG_CHECKS = tuple((re.compile(pattern.encode(), re.IGNORECASE), issue) for pattern, issue in (
+    (r'api_?key\s*[:=]\s*[\'"][^\'"\s]{10,}[\'"]', "硬编码API密钥"),
+    (r'password\s*[:=]\s*[\'"][^\'"\s]{1,}[\'"]', "硬编码密码"),
+    (r'(mysql|postgres|mongodb)://[^\'"\s]+', "硬编码数据库连接"),
+    (r'debug\s*[:=]\s*true', "调试模式启用"),
+))
+
+# DSL注入测试使用的恶意DSL模板，载荷同时出现在意图描述与响应中
+_MALICIOUS_DSL_TEMPLATE = """
+INTENT malicious: "{payload}"
+RULE test_rule
+WHEN INTENT_IS malicious
+THEN
+    RESPOND "{payload}"
+"""
+
 @dataclass
 class SecurityTestResult:
     """安全测试结果"""
@@ -106,44 +171,45 @@ class InputValidationTester:
         results = []
         
         for attack_type, payloads in self.malicious_inputs.items():
+            # 同一攻击类型下的测试名与描述只构造一次
+            test_name = f"DSL注入防护_{attack_type}"
+            fail_description = f"DSL解析器未正确处理{attack_type}攻击载荷"
+            pass_description = f"DSL解析器正确处理了{attack_type}攻击载荷"
+            blocked_description = f"DSL解析器通过异常处理阻止了{attack_type}攻击"
+            
             for payload in payloads:
                 try:
                     # 尝试将恶意载荷作为DSL内容解析
-                    malicious_dsl = f"""
-INTENT malicious: "{payload}"
-RULE test_rule
-WHEN INTENT_IS malicious
-THEN
-    RESPOND "{payload}"
-"""
+                    malicious_dsl = _MALICIOUS_DSL_TEMPLATE.format(payload=payload)
                     
                     # 解析DSL
                     parsed_result = self.parser.parse(malicious_dsl)
+                    parsed_str = str(parsed_result)
                     
                     # 检查是否正确处理了恶意输入
-                    if self._contains_dangerous_content(str(parsed_result)):
+                    if self._contains_dangerous_content(parsed_str):
                         results.append(SecurityTestResult(
-                            test_name=f"DSL注入防护_{attack_type}",
+                            test_name=test_name,
                             status="FAIL",
                             threat_level="HIGH",
-                            description=f"DSL解析器未正确处理{attack_type}攻击载荷",
-                            details={"payload": payload, "parsed_result": str(parsed_result)}
+                            description=fail_description,
+                            details={"payload": payload, "parsed_result": parsed_str}
                         ))
                     else:
                         results.append(SecurityTestResult(
-                            test_name=f"DSL注入防护_{attack_type}",
+                            test_name=test_name,
                             status="PASS",
                             threat_level="LOW",
-                            description=f"DSL解析器正确处理了{attack_type}攻击载荷"
+                            description=pass_description
                         ))
                         
                 except Exception as e:
                     # 异常也是一种防护措施
                     results.append(SecurityTestResult(
-                        test_name=f"DSL注入防护_{attack_type}",
+                        test_name=test_name,
                         status="PASS",
                         threat_level="LOW",
-                        description=f"DSL解析器通过异常处理阻止了{attack_type}攻击",
+                        description=blocked_description,
                         details={"error": str(e)}
                     ))
         
@@ -156,6 +222,9 @@ THEN
         available_intents = {"greeting": "问候", "product_query": "产品咨询"}
         
         for attack_type, payloads in self.malicious_inputs.items():
+            test_name = f"用户输入清理_{attack_type}"
+            pass_description = f"用户输入清理正确处理了{attack_type}攻击载荷"
+            
             for payload in payloads:
                 try:
                     # 测试意图识别是否正确处理恶意输入
@@ -164,14 +233,14 @@ THEN
                     # 检查返回结果是否安全
                     if detected_intent in available_intents or detected_intent == "unknown":
                         results.append(SecurityTestResult(
-                            test_name=f"用户输入清理_{attack_type}",
+                            test_name=test_name,
                             status="PASS",
                             threat_level="LOW",
-                            description=f"用户输入清理正确处理了{attack_type}攻击载荷"
+                            description=pass_description
                         ))
                     else:
                         results.append(SecurityTestResult(
-                            test_name=f"用户输入清理_{attack_type}",
+                            test_name=test_name,
                             status="WARNING",
                             threat_level="MEDIUM",
                             description=f"用户输入清理返回了异常结果：{detected_intent}",
@@ -180,7 +249,7 @@ THEN
                         
                 except Exception as e:
                     results.append(SecurityTestResult(
-                        test_name=f"用户输入清理_{attack_type}",
+                        test_name=test_name,
                         status="PASS",
                         threat_level="LOW",
                         description=f"用户输入清理通过异常处理阻止了{attack_type}攻击",
@@ -191,35 +260,13 @@ THEN
     
     def _contains_dangerous_content(self, content: str) -> bool:
         """检查内容是否包含危险元素"""
-        dangerous_patterns = [
-            r'<script.*?>.*?</script>',
-            r'javascript:',
-            r'DROP\s+TABLE',
-            r'DELETE\s+FROM',
-            r'rm\s+-rf',
-            r'/etc/passwd',
-            r'%[nxsp]',
-            r'\x00'
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, content, re.IGNORECASE | re.DOTALL):
-                return True
-        
-        return False
+        return _DANGEROUS_PATTERN.search(content) is not None
 
 class DataPrivacyTester:
     """数据隐私测试器"""
     
     def __init__(self):
-        self.sensitive_patterns = {
-            'phone_number': r'\b1[3-9]\d{9}\b',
-            'id_card': r'\b\d{15}|\d{18}\b',
-            'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'credit_card': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
-            'api_key': r'[A-Za-z0-9]{32,}',
-            'password': r'password\s*[:=]\s*[\'"]?([^\s\'"]+)',
-        }
+        self.sensitive_patterns = _SENSITIVE_PATTERNS
     
     def test_sensitive_data_exposure(self) -> List[SecurityTestResult]:
         """测试敏感数据泄露"""
@@ -259,13 +306,9 @@ class DataPrivacyTester:
     
     def _detect_sensitive_data(self, text: str) -> List[str]:
         """检测文本中的敏感数据"""
-        detected = []
-        
-        for data_type, pattern in self.sensitive_patterns.items():
-            if re.search(pattern, text, re.IGNORECASE):
-                detected.append(data_type)
-        
-        return detected
+        if not _SENSITIVE_ANY.search(text):
+            return []
+        return [data_type for data_type, pattern in self.sensitive_patterns.items() if pattern.search(text)]
 
 class ConfigSecurityTester:
     """配置安全测试器"""
@@ -288,11 +331,13 @@ class ConfigSecurityTester:
                 continue
                 
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
                 # 检查硬编码敏感信息
-                security_issues = self._check_config_security(content)
+                with open(config_path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        security_issues = []
+                    else:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                            security_issues = self._check_config_security(content)
                 
                 if security_issues:
                     results.append(SecurityTestResult(
@@ -320,27 +365,9 @@ class ConfigSecurityTester:
         
         return results
     
-    def _check_config_security(self, content: str) -> List[str]:
-        """检查配置内容的安全问题"""
-        issues = []
-        
-        # 检查硬编码API密钥
-        if re.search(r'api_?key\s*[:=]\s*[\'"][^\'"\s]{10,}[\'"]', content, re.IGNORECASE):
-            issues.append("硬编码API密钥")
-        
-        # 检查硬编码密码
-        if re.search(r'password\s*[:=]\s*[\'"][^\'"\s]{1,}[\'"]', content, re.IGNORECASE):
-            issues.append("硬编码密码")
-        
-        # 检查硬编码数据库连接字符串
-        if re.search(r'(mysql|postgres|mongodb)://[^\'"\s]+', content, re.IGNORECASE):
-            issues.append("硬编码数据库连接")
-        
-        # 检查调试模式
-        if re.search(r'debug\s*[:=]\s*true', content, re.IGNORECASE):
-            issues.append("调试模式启用")
-        
-        return issues
+    def _check_config_security(self, content: bytes) -> List[str]:
+        """检查配置内容（bytes 或 mmap）的安全问题：硬编码API密钥、密码、数据库连接字符串及调试模式"""
+        return [issue for pattern, issue in _CONFIG_CHECKS if pattern.search(content)]
 
 class SecurityReporter:
     """安全测试报告生成器"""
@@ -398,10 +425,10 @@ class SecurityReporter:
         }
     
     def _generate_html_report(self, report_data: Dict[str, Any], html_file: str):
-        """生成HTML安全报告"""
+        """生成HTML安全报告，页头、各结果行与页尾依次写入文件，不拼接整页字符串"""
         import time
         
-        html_content = f"""
+        header = f"""
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -488,12 +515,15 @@ class SecurityReporter:
             <tbody>
 """
         
-        for result in report_data['results']:
-            status_class = result['status'].lower()
-            threat_class = result['threat_level'].lower()
-            details_str = json.dumps(result['details'], ensure_ascii=False) if result['details'] else ""
+        with open(html_file, 'w', encoding='utf-8') as f:
+            f.write(header)
             
-            html_content += f"""
+            for result in report_data['results']:
+                status_class = result['status'].lower()
+                threat_class = result['threat_level'].lower()
+                details_str = json.dumps(result['details'], ensure_ascii=False) if result['details'] else ""
+                
+                f.write(f"""
                 <tr>
                     <td>{result['test_name']}</td>
                     <td class="{status_class}">{result['status']}</td>
@@ -501,19 +531,16 @@ class SecurityReporter:
                     <td>{result['description']}</td>
                     <td class="details" title="{details_str}">{details_str[:50]}...</td>
                 </tr>
-"""
-        
-        html_content += """
+""")
+            
+            f.write("""
             </tbody>
         </table>
     </div>
 </body>
-</html>"""
-        
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+</html>""")
 
-def main():
+def main(argv=None):
     """安全测试主入口"""
     import argparse
     
@@ -521,7 +548,7 @@ def main():
     parser.add_argument('--include-injection-tests', action='store_true', help='包含注入攻击测试')
     parser.add_argument('--output', default='test_reports', help='报告输出目录')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     print("🔒 开始系统安全测试...")
     print("=" * 60)
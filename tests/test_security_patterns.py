@@ -0,0 +1,63 @@
+import re
+import sys
+
+import pytest
+
+import test_security
+from test_security import (
+    InputValidationTester,
+    _DANGEROUS_SOURCE,
+    _SENSITIVE_ANY,
+    _SENSITIVE_PATTERNS,
+    _WHITESPACE,
+)
+
+# 安全扫描正则: 检测结论不应依赖是否安装了可选的 RE2
+
+# 全角空格、不换行空格等 Unicode 空白，以及大小写折叠字符（ſ / K）
+_UNICODE_VARIANTS = [
+    'DROP　TABLE users',
+    'DROP\x0bTABLE users',
+    'DROP\x85TABLE users',
+    'DELETE\xa0FROM orders',
+    'rm -rf /',
+    'rm\t\n-rf /',
+    'javaſcript:alert(1)',
+    '<ſcript>x</script>',
+    '<SCRIPT>\nalert(1)\n</script>',
+    '%N%S',
+    '安全输入',
+    '',
+]
+
+
+def _scan_inputs():
+    payloads = [p for group in InputValidationTester().malicious_inputs.values() for p in group]
+    return payloads + _UNICODE_VARIANTS
+
+
+def test_whitespace_class_matches_unicode_space():
+    ws = re.compile(_WHITESPACE)
+    expected = {c for c in map(chr, range(sys.maxunicode + 1)) if c.isspace()}
+    actual = {c for c in map(chr, range(sys.maxunicode + 1)) if ws.fullmatch(c)}
+    assert actual == expected
+
+
+def test_sensitive_patterns_always_use_stdlib_re():
+    # \b 的 Unicode 语义只有标准库 re 提供，RE2 的 \b 只认 ASCII
+    assert isinstance(_SENSITIVE_ANY, re.Pattern)
+    assert all(isinstance(p, re.Pattern) for p in _SENSITIVE_PATTERNS.values())
+    assert _SENSITIVE_PATTERNS['phone_number'].search('我的手机号是13812345678') is None
+
+
+def test_dangerous_pattern_engine_parity():
+    re2 = pytest.importorskip('re2')
+    with_re = re.compile(_DANGEROUS_SOURCE)
+    with_re2 = re2.compile(_DANGEROUS_SOURCE)
+    for text in _scan_inputs():
+        assert bool(with_re.search(text)) == bool(with_re2.search(text)), repr(text[:40])
+
+
+def test_dangerous_pattern_detects_unicode_whitespace_variants():
+    for text in _UNICODE_VARIANTS[:6]:
+        assert test_security._DANGEROUS_PATTERN.search(text), repr(text)
@@ -1,17 +1,30 @@
 import json
+from collections import deque
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 import requests
+from requests.adapters import HTTPAdapter
 
 # 请替换XXXXXXXXXX为您的 APIpassword, 获取地址：https://console.xfyun.cn/services/bmx1
 api_key = "Bearer UuzpxGawsChJBdvajtVh:AEpkMYQXCPoRxvpQptmj"
 url = "https://spark-api-open.xf-yun.com/v1/chat/completions"
 
+# 复用同一个会话，多轮对话间共享TCP/TLS连接，避免每轮重新握手
+_session = requests.Session()
+_session.headers.update({
+    'Authorization': api_key,
+    'content-type': "application/json"
+})
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 # 请求模型，并将结果输出
 def get_answer(message):
     # 初始化请求体
-    headers = {
-        'Authorization': api_key,
-        'content-type': "application/json"
-    }
     body = {
         "model": "lite",
         "user": "user_id",
@@ -19,14 +32,40 @@ def get_answer(message):
         # 可选参数
         "stream": False
     }
-    response = requests.post(url=url, json=body, headers=headers)
+    # 请求头已在会话上设置content-type，这里直接发送编码好的UTF-8字节
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(body)
+    else:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    response = _session.post(url=url, data=payload)
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
         return data['choices'][0]['message']['content']
     else:
         raise Exception(f"调用API时发生错误: {response.status_code}, {response.text}")
 
-# 管理对话历史，按序编为列表
+# 对话历史：消息队列及其content累计长度，长度随追加/裁剪增量维护
+class ChatHistory:
+    def __init__(self):
+        self.messages = deque()
+        self.total = 0
+
+    def append(self, message):
+        self.messages.append(message)
+        self.total += len(message["content"])
+
+    def popleft(self):
+        message = self.messages.popleft()
+        self.total -= len(message["content"])
+        return message
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def __len__(self):
+        return len(self.messages)
+
+# 管理对话历史，按序追加
 def getText(text, role, content):
     jsoncon = {}
     jsoncon["role"] = role
@@ -36,6 +75,8 @@ def getText(text, role, content):
 
 # 获取对话中的所有角色的content长度
 def getlength(text):
+    if isinstance(text, ChatHistory):
+        return text.total
     length = 0
     for content in text:
         temp = content["content"]
@@ -43,8 +84,12 @@ def getlength(text):
         length += leng
     return length
 
-# 判断长度是否超长，当前限制8K tokens
+# 判断长度是否超长，当前限制8K tokens；ChatHistory从头部裁剪并直接更新累计长度
 def checklen(text):
+    if isinstance(text, ChatHistory):
+        while text and text.total > 11000:
+            text.popleft()
+        return text
     while (getlength(text) > 11000):
         del text[0]
     return text
@@ -52,8 +97,8 @@ def checklen(text):
 # 主程序入口
 if __name__ == '__main__':
 
-    # 对话历史存储列表
-    chatHistory = []
+    # 对话历史存储队列
+    chatHistory = ChatHistory()
     print("输入 'exit' 以结束对话。")
     # 循环对话轮次
     while True:
@@ -66,7 +111,7 @@ if __name__ == '__main__':
             question = checklen(getText(chatHistory, "user", Input))
             # 开始输出模型内容
             print("星火:", end="", flush=True)
-            answer = get_answer(question)
+            answer = get_answer(list(question))
             print(answer)
             getText(chatHistory, "assistant", answer)
         except Exception as e:
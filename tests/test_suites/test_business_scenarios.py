@@ -5,10 +5,6 @@
 测试完整的业务场景流程
 """
 
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
 from drivers.test_driver import TestSuite
 from core.form_based_system import FormBasedDialogSystem, SlotStatus
 from semantics.option_mapping import SemanticMapper
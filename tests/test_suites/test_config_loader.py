@@ -5,10 +5,6 @@
 测试业务配置加载和管理功能
 """
 
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
 from drivers.test_driver import TestSuite
 from knowledge.business_config_loader import business_config_loader
 
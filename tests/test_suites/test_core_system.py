@@ -5,10 +5,6 @@
 测试表单对话系统的核心功能
 """
 
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
 from drivers.test_driver import TestSuite
 from core.form_based_system import FormBasedDialogSystem, SlotStatus
 from semantics.option_mapping import SemanticMapper
@@ -84,8 +80,8 @@ def test_form_completion_check():
     from core.form_based_system import SlotValue
     for slot_name, slot in form.current_form.items():
         if slot.definition.required:
-            slot.status = SlotStatus.FILLED
             slot.value = SlotValue('test_value', 0.9, 'test', 'test')
+            form._set_slot_status(slot, SlotStatus.FILLED)
     
     assert form._check_form_completeness() == True
     return True
@@ -10,10 +10,6 @@
 - 并发安全测试
 """
 
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
 from drivers.test_driver import TestSuite
 from stubs.mock_config_loaders import MockBusinessConfigLoader, MockYAMLFlowLoader
 from stubs.mock_semantic_mapper import MockSemanticMapper
@@ -3,9 +3,6 @@
 ================
 测试智能意图识别和推荐功能
 """
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from drivers.test_driver import TestSuite
 from core.form_based_system import FormBasedDialogSystem, SlotStatus
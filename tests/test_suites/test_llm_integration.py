@@ -5,10 +5,6 @@ LLM集成测试套件
 测试与大语言模型的集成功能
 """
 
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
 from drivers.test_driver import TestSuite
 from stubs.mock_llm_client import MockLLMClient
 